@@ -10,7 +10,6 @@ from datetime import date, datetime, timezone
 from typing import TYPE_CHECKING
 
 # module
-from avwx.exceptions import BadStation
 from avwx.station import Station
 
 if TYPE_CHECKING:
@@ -26,8 +25,8 @@ except ImportError:
 def find_station(report: str) -> Station | None:
     """Returns the first Station found in a report string"""
     for item in report.split():
-        with suppress(BadStation):
-            return Station.from_code(item.upper())
+        if station := Station.from_codes([item])[0]:
+            return station
     return None
 
 
@@ -17,7 +17,7 @@ from avwx.current.base import Report, get_wx_codes
 from avwx.parsing import core, remarks, speech, summary
 from avwx.parsing.sanitization.metar import clean_metar_list, clean_metar_string
 from avwx.parsing.translate.metar import translate_metar
-from avwx.service import Noaa
+from avwx.service import Noaa, NoaaBulkStation
 from avwx.static.core import FLIGHT_RULES
 from avwx.static.metar import METAR_RMK
 from avwx.station import uses_na_format, valid_station
@@ -98,7 +98,7 @@ class Metar(Report):
     @property
     def _should_check_default(self) -> bool:
         """Return True if pulled from regional source and potentially out of date."""
-        if isinstance(self.service, Noaa) or self.source is None:
+        if isinstance(self.service, (Noaa, NoaaBulkStation)) or self.source is None:
             return False
 
         if self.data is None or self.data.time is None or self.data.time.dt is None:
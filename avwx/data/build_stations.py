@@ -23,6 +23,7 @@ import httpx
 
 # module
 from avwx.data.mappers import FILE_REPLACE, SURFACE_TYPES
+from avwx.station.table import write_table
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -39,6 +40,7 @@ _FILE_DIR = Path(__file__).parent
 _DATA = _FILE_DIR / "files"
 GOOD_PATH = _DATA / "good_stations.txt"
 OUTPUT_PATH = _DATA / "stations.json"
+TABLE_PATH = _DATA / "stations.bin"
 
 
 DATA_ROOT = "https://davidmegginson.github.io/ourairports-data/"
@@ -251,17 +253,23 @@ def update_station_info_date() -> None:
 
 def save_station_data(stations: dict) -> None:
     """Save stations to JSON package data."""
-    json.dump(
-        stations,
-        OUTPUT_PATH.open("w", encoding="utf8"),
-        sort_keys=True,
-        indent=1,
-        ensure_ascii=False,
-    )
+    # Closed before the table is built from it
+    with OUTPUT_PATH.open("w", encoding="utf8") as out:
+        json.dump(stations, out, sort_keys=True, indent=1, ensure_ascii=False)
+
+
+def build_table() -> int:
+    """Build the binary station table from the existing stations.json file."""
+    if not OUTPUT_PATH.exists():
+        LOG.error("No station file to build the table from")
+        return 1
+    with OUTPUT_PATH.open(encoding="utf8") as fin:
+        write_table(json.load(fin), TABLE_PATH)
+    return 0
 
 
 def main() -> int:
-    """Build/update the stations.json main file."""
+    """Build/update the stations.json and stations.bin main files."""
     LOG.info("Fetching")
     if not download_source_files():
         LOG.error("Unable to update source files")
@@ -278,6 +286,8 @@ def main() -> int:
     stations = add_runways(stations, code_map)
     LOG.info("Saving")
     save_station_data(stations)
+    if build_table():
+        return 1
     LOG.info("Updating station date")
     update_station_info_date()
     return 0
@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import json
+import os
+import pickle
+import tempfile
+from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -71,3 +75,105 @@ class LazyCalc:
         if self._value is None:
             self._value = self._func()
         return self._value
+
+
+def cache_dir() -> Path | None:
+    """Return the derived data cache directory or None if disabled.
+
+    Set AVWX_CACHE_DIR to change the location or to an empty string to disable.
+    """
+    if (path := os.environ.get("AVWX_CACHE_DIR")) is not None:
+        return Path(path) if path else None
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "avwx"
+
+
+class DiskCache:
+    """Versioned on-disk store for values derived from package data.
+
+    Each entry is its own file, so writing one never rewrites the others and
+    processes filling the cache at the same time don't lose entries. Entries
+    are ignored and rebuilt if their format version or data key no longer match.
+    """
+
+    VERSION = 1
+
+    name: str
+    _key_func: Callable[[], str]
+    _key: str | None = None
+
+    def __init__(self, name: str, key: Callable[[], str]):
+        self.name = name
+        self._key_func = key
+        # Values set while the disk cache is disabled
+        self._memory: dict[str, Any] = {}
+
+    @property
+    def path(self) -> Path | None:
+        """Directory holding the cache's entry files."""
+        if (root := cache_dir()) is None:
+            return None
+        return root / self.name
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            self._key = self._key_func()
+        return self._key
+
+    def get(self, name: str) -> Any | None:
+        """Return a cached value or None if missing, stale, or unreadable."""
+        if (path := self.path) is None:
+            return self._memory.get(name)
+        try:
+            with path.joinpath(f"{name}.pickle").open("rb") as fin:
+                # The header is checked before loading the value
+                if pickle.load(fin) != (self.VERSION, self.key):  # noqa: S301
+                    return None
+                return pickle.load(fin)  # noqa: S301
+        except Exception:  # noqa: BLE001
+            # Ex: cached value needs an optional module that is no longer installed
+            return None
+
+    def set(self, name: str, value: Any) -> None:
+        """Store a value and write its entry file. Write errors are ignored."""
+        if (path := self.path) is None:
+            self._memory[name] = value
+            return
+        with suppress(OSError):
+            path.mkdir(parents=True, exist_ok=True)
+            handle, temp = tempfile.mkstemp(".tmp", f"{name}.", path)
+            try:
+                with os.fdopen(handle, "wb") as fout:
+                    pickle.dump((self.VERSION, self.key), fout, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(value, fout, protocol=pickle.HIGHEST_PROTOCOL)
+                Path(temp).replace(path / f"{name}.pickle")
+            finally:
+                Path(temp).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Drop stored values and delete the entry files."""
+        self._memory.clear()
+        self._key = None
+        if (path := self.path) is not None:
+            for entry in path.glob("*.pickle"):
+                with suppress(OSError):
+                    entry.unlink()
+
+
+class CachedCalc(LazyCalc):
+    """Delay data calculation until needed and persist the result to a DiskCache."""
+
+    def __init__(self, func: Callable, cache: DiskCache, name: str):
+        super().__init__(func)
+        self._cache = cache
+        self._name = name
+
+    @property
+    def value(self) -> Any:
+        if self._value is None:
+            self._value = self._cache.get(self._name)
+        if self._value is None:
+            self._value = self._func()
+            self._cache.set(self._name, self._value)
+        return self._value
@@ -1,6 +1,8 @@
 """.. include:: ../../docs/service.md"""
 
 from avwx.service.base import Service
+from avwx.service.bulk import NoaaBulkStation
+from avwx.service.client import HTTPPool, aclose, open  # noqa: A004
 from avwx.service.files import NoaaGfs, NoaaNbm
 from avwx.service.scrape import (
     Amo,
@@ -26,5 +28,9 @@ __all__ = (
     "FaaNotam",
     "NoaaGfs",
     "NoaaNbm",
+    "NoaaBulkStation",
     "Service",
+    "HTTPPool",
+    "open",
+    "aclose",
 )
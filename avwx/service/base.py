@@ -3,8 +3,13 @@
 # stdlib
 from __future__ import annotations
 
+import asyncio as aio
+import time
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from dataclasses import replace
+from itertools import count
 from socket import gaierror
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import httpcore
 
@@ -13,6 +18,13 @@ import httpx
 
 # module
 from avwx.exceptions import SourceError
+from avwx.service.cache import RESPONSE_CACHE, CacheEntry, make_key
+from avwx.service.client import http_client
+from avwx.service.limits import host_limiter
+from avwx.service.retry import CircuitBreaker, RetryPolicy, circuit_breaker
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
 
 _TIMEOUT_ERRORS = (
     httpx.ConnectTimeout,
@@ -54,39 +66,34 @@ class Service:
 
 
 class CallsHTTP:
-    """Service mixin supporting HTTP requests."""
+    """Service mixin supporting HTTP requests.
+
+    Set rate_limit (requests per second), rate_burst, and host_concurrency to
+    limit requests to the service host. See avwx.service.limits
+
+    Set cache_ttl to cache responses. See avwx.service.cache
+
+    Set retry_policy, circuit_threshold, and circuit_reset to change how
+    failed requests are retried. See avwx.service.retry
+    """
 
     method: ClassVar[str] = "GET"
+    rate_limit: ClassVar[float | None] = None
+    rate_burst: ClassVar[int] = 1
+    host_concurrency: ClassVar[int | None] = None
+    # Seconds to reuse cached responses. None disables the response cache
+    cache_ttl: ClassVar[float | None] = None
+    retry_policy: ClassVar[RetryPolicy] = RetryPolicy()
+    # Failures in a row before failing fast. None disables the circuit breaker
+    circuit_threshold: ClassVar[int | None] = 5
+    circuit_reset: ClassVar[float] = 30
 
-    async def _call(
-        self,
-        url: str,
-        params: dict | None = None,
-        headers: dict | None = None,
-        data: Any = None,
-        timeout: int = 10,
-        retries: int = 3,
-    ) -> str:
+    @contextmanager
+    def _handle_errors(self) -> Iterator[None]:
+        """Convert HTTP library exceptions into built-in exceptions."""
         name = self.__class__.__name__
         try:
-            async with httpx.AsyncClient(
-                timeout=timeout,
-                follow_redirects=True,
-            ) as client:
-                for _ in range(retries):
-                    if self.method.lower() == "post":
-                        resp = await client.post(url, params=params, headers=headers, data=data)
-                    else:
-                        resp = await client.get(url, params=params, headers=headers)
-                    if resp.status_code == 200:
-                        break
-                    # Skip retries if remote server error
-                    if resp.status_code >= 500:
-                        msg = f"{name} server returned {resp.status_code}"
-                        raise SourceError(msg)
-                else:
-                    msg = f"{name} server returned {resp.status_code}"
-                    raise SourceError(msg)
+            yield
         except _TIMEOUT_ERRORS as timeout_error:
             msg = f"Timeout from {name} server"
             raise TimeoutError(msg) from timeout_error
@@ -96,4 +103,142 @@ class CallsHTTP:
         except _NETWORK_ERRORS as network_error:
             msg = f"Unable to read data from {name} server"
             raise ConnectionError(msg) from network_error
+
+    def _check_circuit(self, url: str) -> CircuitBreaker | None:
+        """Return the host's circuit breaker. Raises SourceError if it is open."""
+        if self.circuit_threshold is None:
+            return None
+        breaker = circuit_breaker(url, self.circuit_threshold, self.circuit_reset)
+        if not breaker.allow():
+            msg = f"{self.__class__.__name__} server is unavailable after repeated failures"
+            raise SourceError(msg)
+        return breaker
+
+    async def _request(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        data: Any = None,
+        timeout: int = 10,
+        retries: int | None = None,
+        ok: tuple[int, ...] = (200,),
+    ) -> httpx.Response:
+        """Send a request, retrying error responses with the service's retry policy.
+
+        Retries overrides the policy's number of attempts.
+        """
+        name = self.__class__.__name__
+        limiter = host_limiter(url, self.rate_limit, self.rate_burst, self.host_concurrency)
+        breaker = self._check_circuit(url)
+        policy = self.retry_policy if retries is None else replace(self.retry_policy, attempts=retries)
+        started = time.monotonic()
+        try:
+            with self._handle_errors():
+                async with http_client(timeout) as (client, pool):
+                    for attempt in count(1):
+                        async with limiter.slot(), pool.host_limit(url) if pool else nullcontext():
+                            if self.method.lower() == "post":
+                                resp = await client.post(
+                                    url, params=params, headers=headers, data=data, timeout=timeout
+                                )
+                            else:
+                                resp = await client.get(url, params=params, headers=headers, timeout=timeout)
+                        # Skip retries if remote server error
+                        if resp.status_code in ok or resp.status_code >= 500:
+                            break
+                        if (delay := policy.next_delay(attempt, started)) is None:
+                            break
+                        await aio.sleep(delay)
+        except (TimeoutError, ConnectionError):
+            if breaker is not None:
+                breaker.record(success=False)
+            raise
+        if breaker is not None:
+            breaker.record(success=resp.status_code < 500)
+        if resp.status_code not in ok:
+            msg = f"{name} server returned {resp.status_code}"
+            raise SourceError(msg)
+        return resp
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: int = 10,
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streamed response. The body is read while the context is open.
+
+        Streamed requests are not retried since the body may already be consumed.
+        """
+        name = self.__class__.__name__
+        limiter = host_limiter(url, self.rate_limit, self.rate_burst, self.host_concurrency)
+        breaker = self._check_circuit(url)
+        with self._handle_errors():
+            async with http_client(timeout) as (client, pool), limiter.slot():
+                try:
+                    async with (
+                        pool.host_limit(url) if pool else nullcontext(),
+                        client.stream(self.method, url, params=params, headers=headers, timeout=timeout) as resp,
+                    ):
+                        if breaker is not None:
+                            breaker.record(success=resp.status_code < 500)
+                        if resp.status_code != 200:
+                            msg = f"{name} server returned {resp.status_code}"
+                            raise SourceError(msg)
+                        yield resp
+                except (*_TIMEOUT_ERRORS, *_CONNECTION_ERRORS, *_NETWORK_ERRORS):
+                    if breaker is not None:
+                        breaker.record(success=False)
+                    raise
+
+    @staticmethod
+    def _text(resp: httpx.Response) -> str:
+        """Return the response body as text."""
         return str(resp.text)
+
+    async def _call(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        data: Any = None,
+        timeout: int = 10,
+        retries: int | None = None,
+    ) -> str:
+        resp = await self._request(url, params, headers, data, timeout, retries)
+        return self._text(resp)
+
+    async def _cached_call(
+        self,
+        url: str,
+        extract: Callable[[str], Any],
+        params: dict | None = None,
+        timeout: int = 10,
+    ) -> CacheEntry:
+        """Return the extracted response using the response cache.
+
+        Caching is disabled if cache_ttl is None. A fresh entry is returned
+        without a request. Otherwise a conditional request is sent and a 304
+        response reuses the stored value.
+        """
+        if self.cache_ttl is None:
+            return CacheEntry(extract(await self._call(url, params, timeout=timeout)))
+        key = make_key(self.method, url, params, extract.__qualname__)
+        entry = RESPONSE_CACHE.get(key)
+        if entry is not None and entry.is_fresh(self.cache_ttl):
+            return entry
+        headers = entry.validators() if entry is not None else {}
+        resp = await self._request(url, params, headers, timeout=timeout, ok=(200, 304) if headers else (200,))
+        if resp.status_code == 304 and entry is not None:
+            entry = replace(entry, fetched=time.monotonic())
+        else:
+            entry = CacheEntry(
+                extract(self._text(resp)),
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+        RESPONSE_CACHE.set(key, entry)
+        return entry
@@ -6,30 +6,129 @@ for specific stations or updating files behind the scenes.
 
 The `fetch` and `async_fetch` methods are identical except they return
 `List[str]` instead.
+
+Responses are cached and later requests only download the source again if
+it has changed. Pass `changed_only=True` to get `None` instead of the same
+reports the service instance returned last time.
+
+`NoaaBulkStation` is the exception. It indexes a bulk file by station so
+report classes can fetch single stations from memory.
 """
 
 # stdlib
+from __future__ import annotations
+
 import asyncio as aio
+import codecs
+import csv
+import datetime as dt
+import gzip
+import zlib
 from contextlib import suppress
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
+from weakref import WeakKeyDictionary
 
 from avwx.service.base import CallsHTTP, Service
+from avwx.station import valid_station
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
-class NoaaBulk(Service, CallsHTTP):
-    """Subclass for extracting current reports from NOAA CSV files.
+    import httpx
 
-    This class accepts `"metar"`, `"taf"`, `"aircraftreport"`, and
-    `"airsigmet"` as valid report types.
-    """
 
-    _url = "https://aviationweather.gov/data/cache/{}s.cache.csv"
-    _valid_types = ("metar", "taf", "aircraftreport", "airsigmet")
-    _rtype_map: ClassVar[dict[str, str]] = {"airep": "aircraftreport", "pirep": "aircraftreport"}
+# Lines before the column headers and data in NOAA cache files
+_HEADER_LINES = 6
+_GZIP_MAGIC = b"\x1f\x8b"
+_CACHE_URL = "https://aviationweather.gov/data/cache/{}s.cache.csv"
+
+
+async def _text_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Yield UTF-8 lines from a byte stream, decompressing it first if gzipped."""
+    decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+    gunzip: zlib._Decompress | None = None
+    head, buffer = b"", ""
+    async for chunk in chunks:
+        # Wait for enough bytes to check the gzip header
+        if head is not None:
+            head += chunk
+            if len(head) < len(_GZIP_MAGIC):
+                continue
+            if head.startswith(_GZIP_MAGIC):
+                gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            chunk, head = head, None  # type: ignore
+        if gunzip is not None:
+            data = gunzip.decompress(chunk)
+            # Concatenated gzip members
+            while gunzip.eof and gunzip.unused_data:
+                unused = gunzip.unused_data
+                gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                data += gunzip.decompress(unused)
+            chunk = data
+        *lines, buffer = (buffer + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(head or b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _csv_records(lines: AsyncIterator[str], skip: int = 0) -> AsyncIterator[str]:
+    """Join streamed lines into full CSV records, including quoted newlines."""
+    record = ""
+    async for line in lines:
+        if skip:
+            skip -= 1
+            continue
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2 == 0:
+            yield record
+            record = ""
+    if record:
+        yield record
+
+
+class _CachedBulk(CallsHTTP):
+    """Mixin tracking which cached response version an instance last returned."""
+
+    # Always check the source, but only download when it has changed
+    cache_ttl = 0
+    _seen: dict[str, int] | None = None
+
+    def _extract(self, raw: str) -> list[str]:
+        raise NotImplementedError
+
+    async def _fetch_cached(self, url: str, timeout: int, *, changed_only: bool) -> list[str] | None:
+        entry = await self._cached_call(url, self._extract, timeout=timeout)
+        if self._seen is None:
+            self._seen = {}
+        if changed_only and self._seen.get(url) == entry.version:
+            return None
+        self._seen[url] = entry.version
+        return list(entry.value)
+
+
+class _NoaaFile(CallsHTTP):
+    """Mixin for downloading NOAA CSV cache files and reading their report column."""
+
+    report_type: str
+    _url: ClassVar[str]
     _targets: ClassVar[dict[str, int]] = {"aircraftreport": -2}  # else 0
+    # Download the much smaller .gz version of the file
+    compressed: bool = False
 
-    def __init__(self, report_type: str):
-        super().__init__(self._rtype_map.get(report_type, report_type))
+    @property
+    def _file_url(self) -> str:
+        url = self._url.format(self.report_type)
+        return f"{url}.gz" if self.compressed else url
+
+    @staticmethod
+    def _text(resp: httpx.Response) -> str:
+        content = resp.content
+        if content.startswith(_GZIP_MAGIC):
+            return gzip.decompress(content).decode("utf8", errors="replace")
+        return str(resp.text)
 
     @staticmethod
     def _clean_report(report: str) -> str:
@@ -38,27 +137,55 @@ class NoaaBulk(Service, CallsHTTP):
             report = report.replace(remove, " ")
         return " ".join(report.split())
 
+    def _report(self, row: list[str]) -> str | None:
+        """Return the cleaned report from a CSV row."""
+        with suppress(IndexError):
+            return self._clean_report(row[self._targets.get(self.report_type, 0)]) or None
+        return None
+
+
+class NoaaBulk(Service, _NoaaFile, _CachedBulk):
+    """Subclass for extracting current reports from NOAA CSV files.
+
+    This class accepts `"metar"`, `"taf"`, `"aircraftreport"`, and
+    `"airsigmet"` as valid report types.
+    """
+
+    _url = _CACHE_URL
+    _valid_types = ("metar", "taf", "aircraftreport", "airsigmet")
+    _rtype_map: ClassVar[dict[str, str]] = {"airep": "aircraftreport", "pirep": "aircraftreport"}
+
+    def __init__(self, report_type: str, *, compressed: bool | None = None):
+        super().__init__(self._rtype_map.get(report_type, report_type))
+        if compressed is not None:
+            self.compressed = compressed
+
     def _extract(self, raw: str) -> list[str]:
-        reports = []
-        index = self._targets.get(self.report_type, 0)
-        for line in raw.split("\n")[6:]:
-            with suppress(IndexError):
-                if report := self._clean_report(line.split(",")[index]):
-                    reports.append(report)
-        return reports
+        rows = csv.reader(raw.splitlines(keepends=True)[_HEADER_LINES:])
+        return [report for row in rows if (report := self._report(row))]
+
+    async def stream(self, timeout: int = 10) -> AsyncIterator[str]:
+        """Asynchronously yield report strings as the source file downloads.
 
-    def fetch(self, timeout: int = 10) -> list[str]:
+        Reports are parsed line by line so memory use stays flat. The response
+        cache is not used.
+        """
+        async with self._stream(self._file_url, timeout=timeout) as resp:
+            lines = _text_lines(resp.aiter_bytes())
+            async for record in _csv_records(lines, skip=_HEADER_LINES):
+                if report := self._report(next(csv.reader([record]), [])):
+                    yield report
+
+    def fetch(self, timeout: int = 10, *, changed_only: bool = False) -> list[str] | None:
         """Bulk fetch report strings from the service."""
-        return aio.run(self.async_fetch(timeout))
+        return aio.run(self.async_fetch(timeout, changed_only=changed_only))
 
-    async def async_fetch(self, timeout: int = 10) -> list[str]:
+    async def async_fetch(self, timeout: int = 10, *, changed_only: bool = False) -> list[str] | None:
         """Asynchronously bulk fetch report strings from the service."""
-        url = self._url.format(self.report_type)
-        text = await self._call(url, timeout=timeout)
-        return self._extract(text)
+        return await self._fetch_cached(self._file_url, timeout, changed_only=changed_only)
 
 
-class NoaaIntl(Service, CallsHTTP):
+class NoaaIntl(Service, _CachedBulk):
     """Scrapes international reports from NOAA. Designed to
     accompany `NoaaBulk` for AIRMET / SIGMET fetch.
 
@@ -78,12 +205,130 @@ class NoaaIntl(Service, CallsHTTP):
         split = "----------------------"
         return [self._clean_report(line.strip().strip('"')) for line in raw.split(split)]
 
-    def fetch(self, timeout: int = 10) -> list[str]:
+    def fetch(self, timeout: int = 10, *, changed_only: bool = False) -> list[str] | None:
         """Bulk fetch report strings from the service."""
-        return aio.run(self.async_fetch(timeout))
+        return aio.run(self.async_fetch(timeout, changed_only=changed_only))
 
-    async def async_fetch(self, timeout: int = 10) -> list[str]:
+    async def async_fetch(self, timeout: int = 10, *, changed_only: bool = False) -> list[str] | None:
         """Asynchronously bulk fetch report strings from the service."""
         url = self._url.format(self._url_map[self.report_type])
-        text = await self._call(url, timeout=timeout)
-        return self._extract(text)
+        return await self._fetch_cached(url, timeout, changed_only=changed_only)
+
+
+class _StationIndex:
+    """Latest report per station shared by all services using the same file."""
+
+    reports: dict[str, str]
+    updated: dt.datetime | None = None
+
+    def __init__(self) -> None:
+        self.reports = {}
+        self._locks: WeakKeyDictionary[aio.AbstractEventLoop, aio.Lock] = WeakKeyDictionary()
+
+    def lock(self) -> aio.Lock:
+        """Return the update lock for the running event loop."""
+        loop = aio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = aio.Lock()
+        return self._locks[loop]
+
+
+class NoaaBulkStation(Service, _NoaaFile):
+    """Serve single station reports from a periodically downloaded NOAA bulk file.
+
+    One download indexes the latest report for every station, so any number
+    of report objects can fetch from memory until the update interval passes.
+
+    ```python
+    service = avwx.service.NoaaBulkStation("metar")
+    for metar in metars:
+        metar.service = service
+        metar.update()
+    ```
+
+    This class accepts `"metar"` and `"taf"` as valid report types.
+    """
+
+    # Always check the source, but only download when it has changed
+    cache_ttl = 0
+    update_interval: dt.timedelta = dt.timedelta(minutes=2)
+    _url = _CACHE_URL
+    _valid_types = ("metar", "taf")
+    _indexes: ClassVar[dict[str, _StationIndex]] = {}
+
+    def __init__(
+        self,
+        report_type: str,
+        update_interval: dt.timedelta | None = None,
+        *,
+        compressed: bool | None = None,
+    ):
+        super().__init__(report_type)
+        if compressed is not None:
+            self.compressed = compressed
+        if update_interval is not None:
+            self.update_interval = update_interval
+
+    @property
+    def _index(self) -> _StationIndex:
+        # Shared by compressed and uncompressed downloads of the same file
+        url = self._url.format(self.report_type)
+        if url not in self._indexes:
+            self._indexes[url] = _StationIndex()
+        return self._indexes[url]
+
+    @property
+    def last_updated(self) -> dt.datetime | None:
+        """When the station index was last updated."""
+        return self._index.updated
+
+    @property
+    def is_outdated(self) -> bool:
+        """If the station index should be updated based on the update interval."""
+        last = self._index.updated
+        if last is None:
+            return True
+        return dt.datetime.now(tz=dt.timezone.utc) > last + self.update_interval
+
+    def _extract_stations(self, raw: str) -> dict[str, str]:
+        """Map each station to its most recent report."""
+        latest: dict[str, tuple[str, str]] = {}
+        for row in csv.reader(raw.splitlines(keepends=True)[_HEADER_LINES:]):
+            with suppress(IndexError):
+                # raw_text, station_id, observation or issue time
+                station, timestamp = row[1], row[2]
+                if (report := self._report(row)) and (station not in latest or timestamp > latest[station][0]):
+                    latest[station] = timestamp, report
+        return {station: report for station, (_, report) in latest.items()}
+
+    async def update(self, timeout: int = 10) -> bool:
+        """Update the station index if outdated. Returns True if the index was reloaded."""
+        index = self._index
+        async with index.lock():
+            # Another task may have updated while waiting
+            if not self.is_outdated:
+                return False
+            entry = await self._cached_call(self._file_url, self._extract_stations, timeout=timeout)
+            index.reports = entry.value
+            index.updated = dt.datetime.now(tz=dt.timezone.utc)
+        return True
+
+    def fetch(self, station: str, timeout: int = 10) -> str:
+        """Fetch a station's report string, updating the index if needed.
+
+        Returns an empty string if the station has no report.
+        """
+        valid_station(station)
+        if self.is_outdated:
+            aio.run(self.update(timeout))
+        return self._index.reports.get(station, "")
+
+    async def async_fetch(self, station: str, timeout: int = 10) -> str:
+        """Asynchronously fetch a station's report string, updating the index if needed.
+
+        Returns an empty string if the station has no report.
+        """
+        valid_station(station)
+        if self.is_outdated:
+            await self.update(timeout)
+        return self._index.reports.get(station, "")
@@ -0,0 +1,95 @@
+"""HTTP response cache for services.
+
+Responses are stored after extraction along with their ETag and
+Last-Modified headers. Within a service's cache_ttl the stored value is used
+without a request. After that the next request is conditional, and a 304 Not
+Modified response reuses the stored value without downloading or parsing
+the source again.
+"""
+
+# stdlib
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+
+_VERSIONS = count(1)
+
+# (method, url, sorted params, extractor)
+CacheKey = tuple[str, str, tuple, str]
+
+
+@dataclass
+class CacheEntry:
+    """Extracted response value and its validators."""
+
+    value: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched: float = field(default_factory=time.monotonic)
+    # Changes only when new content is downloaded
+    version: int = field(default_factory=lambda: next(_VERSIONS))
+
+    @property
+    def is_conditional(self) -> bool:
+        """Whether the source gave validators for a conditional request."""
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the value can be used without checking the source."""
+        return time.monotonic() - self.fetched < ttl
+
+    def validators(self) -> dict[str, str]:
+        """Return conditional request headers."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Thread-safe LRU store of cache entries."""
+
+    maxsize: int
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        """Return a stored entry."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Store an entry and drop the least recently used past maxsize."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def make_key(method: str, url: str, params: dict | None = None, extractor: str = "") -> CacheKey:
+    """Return the cache key for a request and the function extracting its value."""
+    return method.upper(), url, tuple(sorted((params or {}).items())), extractor
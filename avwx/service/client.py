@@ -0,0 +1,160 @@
+"""Shared HTTP connection pool for all services.
+
+By default every request opens and closes its own client. Servers fetching
+many reports can instead open a process-wide pool so connections are kept
+alive and reused between requests to the same host.
+
+```python
+import avwx
+
+async with avwx.service.open(http2=True):
+    metars = await asyncio.gather(*(avwx.Metar(s).async_update() for s in stations))
+```
+
+The pool is bound to the event loop it was opened in. Requests made from any
+other loop, like the synchronous `fetch` and `update` methods, fall back to
+their own short-lived client.
+"""
+
+# stdlib
+from __future__ import annotations
+
+import asyncio as aio
+from contextlib import asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING, Any
+
+# library
+import httpx
+
+# module
+from avwx.exceptions import MissingExtraModule
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from types import TracebackType
+
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+
+class HTTPPool:
+    """Keep-alive HTTP client shared by all services."""
+
+    http2: bool
+    limits: httpx.Limits
+    max_per_host: int | None
+    _client: httpx.AsyncClient | None = None
+    _loop: aio.AbstractEventLoop | None = None
+
+    def __init__(
+        self,
+        *,
+        http2: bool = False,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 30,
+        max_per_host: int | None = None,
+    ):
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_per_host = max_per_host
+        self._hosts: dict[str, aio.Semaphore] = {}
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the pool has an open client."""
+        return self._client is not None
+
+    def open(self) -> Self:
+        """Open the pool client in the running event loop."""
+        if self._client is not None:
+            return self
+        try:
+            self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2, follow_redirects=True)
+        except ImportError as exc:
+            raise MissingExtraModule(extra="http2") from exc
+        self._loop = aio.get_running_loop()
+        return self
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+        self._client, self._loop = None, None
+        self._hosts.clear()
+
+    async def __aenter__(self) -> Self:
+        return self.open()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    def client(self) -> httpx.AsyncClient | None:
+        """Return the shared client if usable from the running event loop."""
+        if self._client is None:
+            return None
+        try:
+            loop = aio.get_running_loop()
+        except RuntimeError:
+            return None
+        return self._client if loop is self._loop else None
+
+    def host_limit(self, url: str | httpx.URL) -> Any:
+        """Return an async context limiting concurrent requests to the URL's host."""
+        if not self.max_per_host:
+            return nullcontext()
+        host = httpx.URL(url).host
+        if host not in self._hosts:
+            self._hosts[host] = aio.Semaphore(self.max_per_host)
+        return self._hosts[host]
+
+
+_POOL: HTTPPool | None = None
+
+
+def get_pool() -> HTTPPool | None:
+    """Return the process-wide pool if one is open."""
+    return _POOL if _POOL is not None and _POOL.is_open else None
+
+
+def open(**kwargs: Any) -> HTTPPool:  # noqa: A001
+    """Open the process-wide pool used by all services.
+
+    Must be called while an event loop is running. Can be used as an async
+    context manager which closes the pool on exit. Keyword arguments are
+    passed to HTTPPool.
+    """
+    global _POOL  # noqa: PLW0603
+    if (pool := get_pool()) is not None:
+        return pool
+    _POOL = HTTPPool(**kwargs).open()
+    return _POOL
+
+
+async def aclose() -> None:
+    """Close the process-wide pool. Services go back to per-request clients."""
+    global _POOL  # noqa: PLW0603
+    if _POOL is not None:
+        await _POOL.aclose()
+    _POOL = None
+
+
+@asynccontextmanager
+async def http_client(timeout: int) -> AsyncIterator[tuple[httpx.AsyncClient, HTTPPool | None]]:
+    """Yield the shared client and pool if available, else a new client closed on exit."""
+    if (pool := get_pool()) is not None and (client := pool.client()) is not None:
+        yield client, pool
+        return
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        yield client, None
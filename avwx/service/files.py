@@ -5,6 +5,15 @@ which is deleted when the program ends. Fetch requests will extract reports
 from the downloaded file until an update interval has been exceeded, at which
 point the service will check for a newer file. You can also have direct access
 to all downloaded reports.
+
+Set `FileService.shared_dir` or the `AVWX_FILE_CACHE_DIR` environment variable
+to share downloaded files between processes like web server workers. One
+process downloads while the others wait for it and then read the same file.
+
+Services created with `stations` only download those stations' reports. The
+station offsets of the last full file are reused to request just those parts
+with HTTP Range requests. If the new file's layout doesn't match, the full
+file is downloaded instead.
 """
 
 # stdlib
@@ -13,22 +22,36 @@ from __future__ import annotations
 import asyncio as aio
 import atexit
 import datetime as dt
+import hashlib
+import io
+import mmap
+import os
 import tempfile
+import threading
 import warnings
-from contextlib import suppress
+from contextlib import asynccontextmanager, nullcontext, suppress
+from dataclasses import dataclass
 from pathlib import Path
 from socket import gaierror
 from typing import TYPE_CHECKING, ClassVar, TextIO
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
 # library
 import httpx
 
 # module
 from avwx.service.base import Service
+from avwx.service.client import http_client
 from avwx.station import valid_station
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Iterable, Iterator
+
+    from avwx.service.client import HTTPPool
 
 _TEMP_DIR = tempfile.TemporaryDirectory()
 _TEMP = Path(_TEMP_DIR.name)
@@ -36,6 +59,11 @@ _TEMP = Path(_TEMP_DIR.name)
 
 _HTTPX_EXCEPTIONS = (httpx.ConnectTimeout, httpx.ReadTimeout, httpx.RemoteProtocolError)
 
+# Bytes requested past each report to check where the next one starts
+_RANGE_PAD = 64
+# HEAD responses from servers that only allow GET
+_NO_HEAD = (405, 501)
+
 
 @atexit.register
 def _cleanup() -> None:
@@ -43,34 +71,167 @@ def _cleanup() -> None:
     _TEMP_DIR.cleanup()
 
 
+def _set_result(future: aio.Future[bool], result: bool) -> None:  # noqa: FBT001
+    if not future.done():
+        future.set_result(result)
+
+
+@asynccontextmanager
+async def _file_lock(path: Path) -> AsyncIterator[None]:
+    """Hold an exclusive lock shared with other processes."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        # Without fcntl, processes may download the same file but never read a partial one
+        if fcntl is not None:
+            await aio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Also releases the lock
+        os.close(fd)
+
+
+def _merge_ranges(ranges: list[tuple[int, int]], gap: int) -> list[tuple[int, int]]:
+    """Merge sorted (start, end) ranges separated by at most gap bytes."""
+    merged: list[tuple[int, int]] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + gap:
+            merged[-1] = merged[-1][0], max(merged[-1][1], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _map_file(path: Path) -> mmap.mmap | bytes:
+    """Memory map a file for reading."""
+    with path.open("rb") as fin:
+        # Empty files can't be mapped
+        if not path.stat().st_size:
+            return b""
+        return mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@dataclass(frozen=True)
+class _ManagedFile:
+    """Downloaded file contents replaced as a whole on update."""
+
+    path: Path
+    updated: dt.datetime
+    data: mmap.mmap | bytes
+    offsets: dict[str, tuple[int, int]] | None = None
+
+
+class _FileState:
+    """Current file and update coordination for a single managed file.
+
+    Only one update runs at a time across every thread and event loop.
+    Waiters get a future on their own loop that resolves once when the
+    update finishes.
+    """
+
+    file: _ManagedFile | None = None
+    updating: bool = False
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waiters: list[aio.Future[bool]] = []
+
+    def start(self) -> bool:
+        """Claim the update. Returns False if another update is running."""
+        with self._lock:
+            if self.updating:
+                return False
+            self.updating = True
+            return True
+
+    def finish(self, result: bool) -> None:  # noqa: FBT001
+        """Release the update and wake all waiters with its result."""
+        with self._lock:
+            self.updating = False
+            waiters, self._waiters = self._waiters, []
+        for future in waiters:
+            # The waiting loop may have closed
+            with suppress(RuntimeError):
+                future.get_loop().call_soon_threadsafe(_set_result, future, result)
+
+    def waiter(self) -> aio.Future[bool] | None:
+        """Return a future for the running update's result or None if not updating."""
+        with self._lock:
+            if not self.updating:
+                return None
+            future = aio.get_running_loop().create_future()
+            self._waiters.append(future)
+            return future
+
+
+_STATES: dict[str, _FileState] = {}
+_STATES_LOCK = threading.Lock()
+
+
 class FileService(Service):
     """Service class for fetching reports via managed source files."""
 
     update_interval: dt.timedelta = dt.timedelta(minutes=10)
-    _updating: bool = False
+    # Candidate URLs checked at the same time when finding the newest file
+    probe_concurrency: int = 8
+    # Bytes written at a time while downloading
+    chunk_size: int = 64 * 1024
+    # Directory for files shared with other processes. Defaults to AVWX_FILE_CACHE_DIR
+    shared_dir: ClassVar[Path | str | None] = None
+    # Only download these stations' reports if set
+    stations: frozenset[str] | None = None
+    # Separate station ranges closer than this are requested together
+    range_gap: int = 32 * 1024
+    # Station offsets of the last full file per report type
+    _layouts: ClassVar[dict[str, dict[str, tuple[int, int]]]] = {}
+
+    def __init__(self, report_type: str, *, stations: Iterable[str] | None = None):
+        super().__init__(report_type)
+        if stations is not None:
+            self.stations = frozenset(stations)
+            for station in self.stations:
+                valid_station(station)
 
     @property
-    def _file_stem(self) -> str:
+    def _layout_key(self) -> str:
         return f"{self.__class__.__name__}.{self.report_type}"
 
+    @property
+    def _file_stem(self) -> str:
+        if not self.stations:
+            return self._layout_key
+        # Partial files are kept apart from full files
+        digest = hashlib.sha256(",".join(sorted(self.stations)).encode()).hexdigest()
+        return f"{self._layout_key}.{digest[:8]}"
+
+    @property
+    def _state(self) -> _FileState:
+        """File state shared by every instance managing the same file."""
+        with _STATES_LOCK:
+            if self._file_stem not in _STATES:
+                _STATES[self._file_stem] = _FileState()
+            return _STATES[self._file_stem]
+
+    @property
+    def _shared_dir(self) -> Path | None:
+        path = self.shared_dir or os.environ.get("AVWX_FILE_CACHE_DIR")
+        return Path(path) if path else None
+
+    @property
+    def _updating(self) -> bool:
+        """If the managed file is being updated."""
+        return self._state.updating
+
     @property
     def _file(self) -> Path | None:
         """Path object of the managed data file."""
-        for path in _TEMP.glob(f"{self._file_stem}*"):
-            return path
-        return None
+        file = self._state.file
+        return None if file is None else file.path
 
     @property
     def last_updated(self) -> dt.datetime | None:
         """When the file was last updated."""
-        file = self._file
-        if file is None:
-            return None
-        try:
-            timestamp = int(file.name.split(".")[-2])
-            return dt.datetime.fromtimestamp(timestamp, tz=dt.timezone.utc)
-        except (AttributeError, ValueError):
-            return None
+        file = self._state.file
+        return None if file is None else file.updated
 
     @property
     def is_outdated(self) -> bool:
@@ -81,14 +242,11 @@ class FileService(Service):
         now = dt.datetime.now(tz=dt.timezone.utc)
         return now > last + self.update_interval
 
-    def _new_path(self) -> Path:
-        now = dt.datetime.now(tz=dt.timezone.utc).timestamp()
-        timestamp = str(now).split(".", maxsplit=1)[0]
-        return _TEMP / f"{self._file_stem}.{timestamp}.txt"
-
-    async def _wait_until_updated(self) -> None:
-        while not self._updating:
-            await aio.sleep(0.01)
+    async def _wait_until_updated(self) -> bool:
+        """Wait for a running update to finish. Returns its success."""
+        waiter = self._state.waiter()
+        # Also True if the update finished before we could wait
+        return True if waiter is None else await waiter
 
     @property
     def all(self) -> list[str]:
@@ -102,25 +260,179 @@ class FileService(Service):
     def _extract(self, station: str, source: TextIO) -> str | None:
         raise NotImplementedError
 
+    def _index_file(self, data: bytes | mmap.mmap) -> dict[str, tuple[int, int]] | None:  # noqa: ARG002
+        """Map each station to the (start, end) byte offsets of its report.
+
+        Services without an index return None and use _extract on the full file.
+        """
+        return None
+
+    def _extract_report(self, station: str, text: str) -> str | None:
+        """Format a report from its indexed byte range."""
+        raise NotImplementedError
+
+    def _set_file(self, path: Path, updated: dt.datetime, *, complete: bool) -> None:
+        """Map and index a saved file as the current file.
+
+        The offsets of complete files are kept to request later files by range.
+        """
+        data = _map_file(path)
+        file = _ManagedFile(path, updated, data, self._index_file(data))
+        if complete and file.offsets:
+            self._layouts[self._layout_key] = file.offsets
+        self._state.file = file
+
+    @staticmethod
+    async def _probe(
+        client: httpx.AsyncClient, pool: HTTPPool | None, url: str, semaphore: aio.Semaphore, timeout: int
+    ) -> bool:
+        """Return True if the URL exists without downloading it."""
+        async with semaphore, pool.host_limit(url) if pool else nullcontext():
+            resp = await client.head(url, timeout=timeout)
+            if resp.status_code in _NO_HEAD:
+                # Closing the stream without reading drops the body
+                async with client.stream("GET", url, timeout=timeout) as resp:
+                    pass
+        return resp.status_code == 200
+
+    async def _newest_url(self, client: httpx.AsyncClient, pool: HTTPPool | None, timeout: int) -> str | None:
+        """Return the first candidate URL that exists.
+
+        Candidates are probed concurrently in order, so the newest file is
+        found in about one round trip instead of one per missing file.
+        """
+        urls = list(self._urls)
+        semaphore = aio.Semaphore(self.probe_concurrency)
+        probes = [aio.create_task(self._probe(client, pool, url, semaphore, timeout)) for url in urls]
+        try:
+            for url, probe in zip(urls, probes, strict=True):
+                if await probe:
+                    return url
+        finally:
+            for probe in probes:
+                probe.cancel()
+            await aio.gather(*probes, return_exceptions=True)
+        return None
+
+    @staticmethod
+    async def _fetch_range(
+        client: httpx.AsyncClient,
+        pool: HTTPPool | None,
+        url: str,
+        byte_range: tuple[int, int],
+        semaphore: aio.Semaphore,
+        timeout: int,
+    ) -> bytes | None:
+        """Return the bytes in a (start, end) range or None if not served as requested."""
+        start, end = byte_range
+        # Ranges apply to the encoded body, so ask for none
+        headers = {"Range": f"bytes={start}-{end - 1}", "Accept-Encoding": "identity"}
+        async with (
+            semaphore,
+            pool.host_limit(url) if pool else nullcontext(),
+            client.stream("GET", url, headers=headers, timeout=timeout) as resp,
+        ):
+            # Rejected ranges (405, 416) fall back to the full file. Servers ignoring
+            # the range send the full file which we don't want to read here
+            if resp.status_code != 206 or not resp.headers.get("Content-Range", "").startswith(f"bytes {start}-"):
+                return None
+            return await resp.aread()
+
+    async def _fetch_stations(
+        self, client: httpx.AsyncClient, pool: HTTPPool | None, url: str, timeout: int
+    ) -> list[bytes] | None:
+        """Return only the reports of the selected stations using HTTP Range requests.
+
+        Offsets come from the last full file. Returns None if there are none,
+        a station isn't in them, or the reports in this file don't start and
+        end at the same offsets. The full file is downloaded instead, which
+        also refreshes the offsets.
+        """
+        if not self.stations or (layout := self._layouts.get(self._layout_key)) is None:
+            return None
+        if not self.stations <= layout.keys():
+            return None
+        blocks = sorted((layout[station], station) for station in self.stations)
+        ranges = _merge_ranges([(start, end + _RANGE_PAD) for (start, end), _ in blocks], self.range_gap)
+        semaphore = aio.Semaphore(self.probe_concurrency)
+        parts = await aio.gather(*(self._fetch_range(client, pool, url, r, semaphore, timeout) for r in ranges))
+        reports, i = [], 0
+        for (start, end), station in blocks:
+            while ranges[i][1] < end + _RANGE_PAD:
+                i += 1
+            if (part := parts[i]) is None:
+                return None
+            block = part[start - ranges[i][0] : end + _RANGE_PAD - ranges[i][0]]
+            # The next report header must start where the last file's did
+            if (self._index_file(block) or {}).get(station) != (0, end - start):
+                return None
+            reports.append(block[: end - start])
+        return reports
+
+    async def _download(self, directory: Path, timeout: int) -> tuple[Path, bool] | None:
+        """Stream the most recent file to a new file in a directory.
+
+        The body is written in chunks and synced to disk before returning.
+        Returns the path and whether it's the full file or only the selected
+        stations.
+        """
+        # Unique even if updated again within the same second
+        handle, name = tempfile.mkstemp(".txt", f"{self._file_stem}.", directory)
+        path, success = Path(name), False
+        try:
+            with os.fdopen(handle, "wb") as fout:
+                async with http_client(timeout) as (client, pool):
+                    # Find the most recent file
+                    if (url := await self._newest_url(client, pool, timeout)) is None:
+                        return None
+                    if (reports := await self._fetch_stations(client, pool, url, timeout)) is not None:
+                        fout.writelines(reports)
+                    else:
+                        async with (
+                            pool.host_limit(url) if pool else nullcontext(),
+                            client.stream("GET", url, timeout=timeout) as resp,
+                        ):
+                            if resp.status_code != 200:
+                                return None
+                            async for chunk in resp.aiter_bytes(self.chunk_size):
+                                fout.write(chunk)
+                fout.flush()
+                os.fsync(fout.fileno())
+            success = True
+        except (*_HTTPX_EXCEPTIONS, gaierror):
+            return None
+        finally:
+            if not success:
+                path.unlink()
+        return path, reports is None
+
     async def _update_file(self, timeout: int) -> bool:
         """Find and save the most recent file."""
-        # Find the most recent file
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            for url in self._urls:
-                try:
-                    resp = await client.get(url)
-                    if resp.status_code == 200:
-                        break
-                except _HTTPX_EXCEPTIONS:
-                    return False
-                except gaierror:
-                    return False
-            else:
+        shared = self._shared_dir
+        if shared is None:
+            if (download := await self._download(_TEMP, timeout)) is None:
+                return False
+            new_path, complete = download
+            self._set_file(new_path, dt.datetime.now(tz=dt.timezone.utc), complete=complete)
+            return True
+        shared.mkdir(parents=True, exist_ok=True)
+        path = shared / f"{self._file_stem}.txt"
+        async with _file_lock(shared / f"{self._file_stem}.lock"):
+            # Another process may have updated the file while we waited
+            with suppress(FileNotFoundError):
+                updated = dt.datetime.fromtimestamp(path.stat().st_mtime, tz=dt.timezone.utc)
+                last = self.last_updated
+                now = dt.datetime.now(tz=dt.timezone.utc)
+                if (last is None or updated > last) and now <= updated + self.update_interval:
+                    # Partial service files may not have every station
+                    self._set_file(path, updated, complete=not self.stations)
+                    return True
+            if (download := await self._download(shared, timeout)) is None:
                 return False
-        # Save successful file download
-        new_path = self._new_path()
-        with new_path.open("wb") as new_file:
-            new_file.write(resp.content)
+            new_path, complete = download
+            # Readers keep the old file mapped until the rename replaces it
+            new_path.replace(path)
+            self._set_file(path, dt.datetime.now(tz=dt.timezone.utc), complete=complete)
         return True
 
     async def update(self, *, wait: bool = False, timeout: int = 10) -> bool:
@@ -128,23 +440,23 @@ class FileService(Service):
 
         If wait, this will block if the file is already being updated.
         """
-        # Guard for other async calls
-        if self._updating:
-            if wait:
-                await self._wait_until_updated()
-                return True
-            return False
-        self._updating = True
-        # Replace file
-        old_path = self._file
-        if not await self._update_file(timeout):
-            self._updating = False
-            return False
-        if old_path:
-            with suppress(FileNotFoundError):
-                old_path.unlink()
-        self._updating = False
-        return True
+        # Guard for other threads and async calls
+        state = self._state
+        if not state.start():
+            return await self._wait_until_updated() if wait else False
+        success = False
+        try:
+            # Replace file
+            old_path = self._file
+            success = await self._update_file(timeout)
+            # Shared files are replaced in place
+            if success and old_path and old_path != self._file:
+                # Windows can't delete a file still mapped by a reader
+                with suppress(OSError):
+                    old_path.unlink()
+        finally:
+            state.finish(success)
+        return success
 
     def fetch(self, station: str, *, wait: bool = True, timeout: int = 10, force: bool = False) -> str | None:
         """Fetch a report string from the source file.
@@ -169,11 +481,16 @@ class FileService(Service):
             await self._wait_until_updated()
         if (force or self.is_outdated) and not await self.update(wait=wait, timeout=timeout):
             return None
-        file = self._file
+        # Keep the same file even if another update replaces it
+        file = self._state.file
         if file is None:
             return None
-        with file.open() as fin:
-            return self._extract(station, fin)
+        if file.offsets is None:
+            return self._extract(station, io.StringIO(file.data[:].decode()))
+        if station not in file.offsets:
+            return None
+        start, end = file.offsets[station]
+        return self._extract_report(station, file.data[start:end].decode())
 
 
 class NoaaForecast(FileService):
@@ -182,10 +499,10 @@ class NoaaForecast(FileService):
     @property
     def all(self) -> list[str]:
         """All report strings available after updating."""
-        if self._file is None:
+        file = self._state.file
+        if file is None:
             return []
-        with self._file.open() as fin:
-            lines = fin.readlines()
+        lines = file.data[:].decode().splitlines()
         reports = []
         report = ""
         for line in lines:
@@ -200,14 +517,31 @@ class NoaaForecast(FileService):
     def _index_target(self, station: str) -> tuple[str, str]:
         raise NotImplementedError
 
-    def _extract(self, station: str, source: TextIO) -> str | None:
-        """Return report pulled from the saved file."""
-        start, end = self._index_target(station)
-        txt = source.read()
-        txt = txt[txt.find(start) :]
-        txt = txt[: txt.find(end, 30)]
+    def _index_file(self, data: bytes | mmap.mmap) -> dict[str, tuple[int, int]]:
+        """Index reports by the station at the start of each guidance header line."""
+        headers = []
+        index = data.find(b"GUIDANCE")
+        while index != -1:
+            line_start = data.rfind(b"\n", 0, index) + 1
+            line = data[line_start:index].decode(errors="ignore")
+            if station := line.strip().split(" ", 1)[0]:
+                start = line_start + line.find(station)
+                # Same check _extract uses to find the report
+                target = self._index_target(station)[0].encode()
+                if data[start : start + len(target)] == target:
+                    headers.append((station, start, line_start))
+            index = data.find(b"GUIDANCE", index + 1)
+        offsets: dict[str, tuple[int, int]] = {}
+        for i, (station, start, _) in enumerate(headers):
+            # Report ends before the next header line
+            end = headers[i + 1][2] if i + 1 < len(headers) else len(data)
+            offsets.setdefault(station, (start, end))
+        return offsets
+
+    def _extract_report(self, station: str, text: str) -> str | None:  # noqa: ARG002
+        """Clean the report lines up to the first empty line."""
         lines = []
-        for line in txt.split("\n"):
+        for line in text.split("\n"):
             if "CLIMO" not in line:
                 line = line.strip()  # noqa: PLW2901
             if not line:
@@ -215,6 +549,14 @@ class NoaaForecast(FileService):
             lines.append(line)
         return "\n".join(lines) or None
 
+    def _extract(self, station: str, source: TextIO) -> str | None:
+        """Return report pulled from the saved file."""
+        start, end = self._index_target(station)
+        txt = source.read()
+        txt = txt[txt.find(start) :]
+        txt = txt[: txt.find(end, 30)]
+        return self._extract_report(station, txt)
+
 
 class NoaaNbm(NoaaForecast):
     """Request forecast data from NOAA NBM FTP servers."""
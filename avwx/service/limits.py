@@ -0,0 +1,108 @@
+"""Per-host request rate and concurrency limits.
+
+Services set these class attributes to stay under a source's request limits:
+
+- rate_limit: sustained requests per second
+- rate_burst: requests allowed at once before the rate applies
+- host_concurrency: max requests in flight at the same time
+
+Limits are shared by every service with the same host and settings. Requests
+wait for their turn instead of failing, so a large fan-out runs at the
+highest rate the source allows.
+"""
+
+# stdlib
+from __future__ import annotations
+
+import asyncio as aio
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+# library
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class TokenBucket:
+    """Token bucket rate limiter usable from any thread or event loop."""
+
+    rate: float
+    burst: int
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            msg = "Rate must be positive and burst at least 1"
+            raise ValueError(msg)
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens can go negative which queues callers in order
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a request can be sent."""
+        if wait := self.reserve():
+            await aio.sleep(wait)
+
+
+class HostLimiter:
+    """Rate and concurrency limits for a single host."""
+
+    bucket: TokenBucket | None
+    concurrency: int | None
+
+    def __init__(self, rate: float | None = None, burst: int = 1, concurrency: int | None = None):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.concurrency = concurrency
+        # Semaphores are bound to the event loop they're used in
+        self._semaphores: WeakKeyDictionary[aio.AbstractEventLoop, aio.Semaphore] = WeakKeyDictionary()
+
+    def _semaphore(self) -> aio.Semaphore | None:
+        if not self.concurrency:
+            return None
+        loop = aio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = aio.Semaphore(self.concurrency)
+        return self._semaphores[loop]
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and rate token before sending a request."""
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+
+_LIMITERS: dict[tuple[str, float | None, int, int | None], HostLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def host_limiter(url: str, rate: float | None, burst: int = 1, concurrency: int | None = None) -> HostLimiter:
+    """Return the shared limiter for a URL's host and limit settings."""
+    key = (httpx.URL(url).host, rate, burst, concurrency)
+    with _LIMITERS_LOCK:
+        if key not in _LIMITERS:
+            _LIMITERS[key] = HostLimiter(rate, burst, concurrency)
+        return _LIMITERS[key]
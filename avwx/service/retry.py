@@ -0,0 +1,115 @@
+"""Retry backoff and per-host circuit breakers.
+
+Services retry error responses using their retry_policy. The wait between
+attempts grows exponentially with random jitter so many clients don't retry
+in lockstep, and retries stop once max_elapsed seconds have passed.
+
+Server errors, timeouts, and connection failures count against the host's
+circuit breaker. After circuit_threshold failures in a row, requests fail
+immediately with a SourceError instead of waiting on a dead source. Every
+circuit_reset seconds a single request is let through to check if the
+source has recovered.
+"""
+
+# stdlib
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+# library
+import httpx
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter for retried requests."""
+
+    # Total tries including the first request
+    attempts: int = 3
+    # Seconds before the first retry. Multiplied for each retry after
+    backoff: float = 0.25
+    multiplier: float = 2
+    max_delay: float = 5
+    # Fraction of each delay that is random. 1 is full jitter
+    jitter: float = 1
+    # Seconds after the first request to stop retrying
+    max_elapsed: float = 10
+
+    def delay(self, attempt: int) -> float:
+        """Return seconds to wait after a failed attempt starting at 1."""
+        delay = min(self.max_delay, self.backoff * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())  # noqa: S311
+
+    def next_delay(self, attempt: int, started: float) -> float | None:
+        """Return seconds to wait before retrying or None if out of retries."""
+        if attempt >= self.attempts:
+            return None
+        delay = self.delay(attempt)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures from a host.
+
+    Opens after threshold failures in a row. While open, one request is
+    allowed every reset seconds. Its success closes the circuit.
+    """
+
+    threshold: int
+    reset: float
+
+    def __init__(self, threshold: int = 5, reset: float = 30):
+        if threshold < 1 or reset < 0:
+            msg = "Threshold must be at least 1 and reset not negative"
+            raise ValueError(msg)
+        self.threshold = threshold
+        self.reset = reset
+        self._failures = 0
+        self._opened: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """If requests are currently failing fast."""
+        return self._opened is not None
+
+    def allow(self) -> bool:
+        """Return True if a request can be sent."""
+        with self._lock:
+            if self._opened is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened < self.reset:
+                return False
+            # Half-open. Let this request through and hold the rest for another period
+            self._opened = now
+            return True
+
+    def record(self, *, success: bool) -> None:
+        """Record the outcome of a request."""
+        with self._lock:
+            if success:
+                self._failures = 0
+                self._opened = None
+                return
+            self._failures += 1
+            if self._opened is not None or self._failures >= self.threshold:
+                self._opened = time.monotonic()
+
+
+_BREAKERS: dict[tuple[str, int, float], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def circuit_breaker(url: str, threshold: int, reset: float) -> CircuitBreaker:
+    """Return the shared circuit breaker for a URL's host and settings."""
+    key = (httpx.URL(url).netloc.decode(), threshold, reset)
+    with _BREAKERS_LOCK:
+        if key not in _BREAKERS:
+            _BREAKERS[key] = CircuitBreaker(threshold, reset)
+        return _BREAKERS[key]
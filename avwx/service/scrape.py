@@ -11,7 +11,7 @@ import json
 import re
 import secrets
 from contextlib import suppress
-from typing import Any, ClassVar, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
 
 # library
 from xmltodict import parse as parsexml
@@ -24,6 +24,9 @@ from avwx.service.base import CallsHTTP, Service
 from avwx.station import Station, valid_station
 from avwx.structs import Coord
 
+if TYPE_CHECKING:
+    from collections.abc import Coroutine, Iterable, Iterator
+
 _T = TypeVar("_T")
 
 _USER_AGENTS = [
@@ -36,6 +39,17 @@ _USER_AGENTS = [
 ]
 
 
+async def _gather_limited(coros: list[Coroutine[Any, Any, _T]], limit: int) -> list[_T]:
+    """Gather coroutine results running at most limit at a time."""
+    semaphore = aio.Semaphore(limit)
+
+    async def run(coro: Coroutine[Any, Any, _T]) -> _T:
+        async with semaphore:
+            return await coro
+
+    return await aio.gather(*(run(coro) for coro in coros))
+
+
 class ScrapeService(Service, CallsHTTP):
     """Service class for fetching reports via direct web requests.
 
@@ -72,6 +86,8 @@ class ScrapeService(Service, CallsHTTP):
 class StationScrape(ScrapeService):
     """Service class fetching reports from a station code."""
 
+    max_concurrency = 10
+
     def _make_url(self, station: str) -> tuple[str, dict]:  # noqa: ARG002
         """Return a formatted URL and parameters."""
         return self._url, {}
@@ -115,6 +131,28 @@ class StationScrape(ScrapeService):
         url, params = self._make_url(station)
         return await self._fetch(station, url, params, timeout)
 
+    def fetch_many(self, stations: Iterable[str], timeout: int | None = None) -> dict[str, str]:
+        """Fetch report strings for multiple stations from the service."""
+        return aio.run(self.async_fetch_many(stations, timeout))
+
+    async def async_fetch_many(self, stations: Iterable[str], timeout: int | None = None) -> dict[str, str]:
+        """Asynchronously fetch report strings for multiple stations.
+
+        Stations are requested concurrently up to max_concurrency at a time.
+        Stations the service has no report for are returned as an empty string.
+        """
+        idents = list(dict.fromkeys(stations))
+        for station in idents:
+            valid_station(station)
+
+        async def fetch_one(station: str) -> str:
+            with suppress(InvalidRequest):
+                return await self.async_fetch(station, timeout)
+            return ""
+
+        reports = await _gather_limited([fetch_one(station) for station in idents], self.max_concurrency)
+        return dict(zip(idents, reports, strict=True))
+
 
 # Multiple sources for NOAA data
 
@@ -151,15 +189,58 @@ class _NoaaScrapeUrl:
 class NoaaScrape(_NoaaScrapeUrl, StationScrape):
     """Request data from NOAA via response scraping."""
 
-    def _extract(self, raw: str, station: str) -> str:  # noqa: ARG002
-        """Extract the first report."""
+    # Stations requested per call in fetch_many
+    batch_size = 100
+
+    @staticmethod
+    def _split_reports(raw: str) -> Iterator[str]:
+        """Yield each report in a multi-report response."""
         report = ""
         for line in raw.strip().split("\n"):
-            # Break when seeing the second non-indented line (next report)
+            # A non-indented line starts the next report
             if line and line[0].isalnum() and report:
-                break
+                yield report
+                report = ""
             report += line
-        return report
+        if report:
+            yield report
+
+    def _extract(self, raw: str, station: str) -> str:  # noqa: ARG002
+        """Extract the first report."""
+        return next(self._split_reports(raw), "")
+
+    def _extract_many(self, raw: str, stations: list[str]) -> dict[str, str]:
+        """Extract the first report for each station."""
+        targets, reports = set(stations), {}
+        for report in self._split_reports(raw):
+            # Station follows the report type and modifier if present. Ex: TAF AMD KJFK
+            station = next((item for item in report.split()[:3] if item in targets), None)
+            if station and station not in reports:
+                reports[station] = self._clean_report(report)
+        return {station: reports.get(station, "") for station in stations}
+
+    async def _fetch_batch(self, stations: list[str], timeout: int) -> dict[str, str]:
+        url, params = self._make_url(",".join(stations))
+        text = await self._call(url, params=params, headers=self._make_headers(), timeout=timeout)
+        return self._extract_many(text, stations)
+
+    async def async_fetch_many(self, stations: Iterable[str], timeout: int | None = None) -> dict[str, str]:
+        """Asynchronously fetch report strings for multiple stations.
+
+        Stations are sent batch_size at a time in a single request each.
+        Stations the service has no report for are returned as an empty string.
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        idents = list(dict.fromkeys(stations))
+        for station in idents:
+            valid_station(station)
+        batches = [idents[i : i + self.batch_size] for i in range(0, len(idents), self.batch_size)]
+        reports: dict[str, str] = {}
+        coros = [self._fetch_batch(batch, timeout) for batch in batches]
+        for batch in await _gather_limited(coros, self.max_concurrency):
+            reports |= batch
+        return reports
 
 
 class NoaaScrapeList(_NoaaScrapeUrl, ScrapeService):
@@ -223,6 +304,9 @@ class Amo(StationScrape):
 
     _url = "http://amoapi.kma.go.kr/amoApi/{}"
     default_timeout = 60
+    rate_limit = 2
+    rate_burst = 4
+    host_concurrency = 2
 
     def _make_url(self, station: str) -> tuple[str, dict]:
         """Return a formatted URL and parameters."""
@@ -254,6 +338,9 @@ class Mac(StationScrape):
 
     _url = "https://meteorologia.aerocivil.gov.co/expert_text_query/parse"
     method = "POST"
+    rate_limit = 5
+    rate_burst = 5
+    host_concurrency = 4
 
     @staticmethod
     def _make_headers() -> dict:
@@ -274,6 +361,9 @@ class Aubom(StationScrape):
 
     _url = "http://www.bom.gov.au/aviation/php/process.php"
     method = "POST"
+    rate_limit = 5
+    rate_burst = 5
+    host_concurrency = 4
 
     @staticmethod
     def _make_headers() -> dict:
@@ -316,6 +406,9 @@ class Olbs(StationScrape):
 
     # Temp redirect
     _url = "https://avbrief3.el.r.appspot.com/"
+    rate_limit = 5
+    rate_burst = 5
+    host_concurrency = 4
 
     def _make_url(self, station: str) -> tuple[str, dict]:
         """Return a formatted URL and empty parameters."""
@@ -355,6 +448,9 @@ class Nam(StationScrape):
     """Request data from NorthAviMet for North Atlantic and Nordic countries."""
 
     _url = "https://www.northavimet.com/NamConWS/rest/opmet/command/0/"
+    rate_limit = 5
+    rate_burst = 5
+    host_concurrency = 4
 
     def _make_url(self, station: str) -> tuple[str, dict]:
         """Return a formatted URL and empty parameters."""
@@ -13,14 +13,18 @@ not associated with airports like weather buouys.
 """
 
 from avwx.station.meta import __LAST_UPDATED__, station_list, uses_na_format, valid_station
-from avwx.station.search import search
-from avwx.station.station import Station, nearest
+from avwx.station.search import prefix_search, search
+from avwx.station.station import NearestStations, Station, nearest, nearest_many, stations_within
 
 __all__ = (
     "Station",
     "station_list",
     "nearest",
+    "nearest_many",
+    "NearestStations",
+    "stations_within",
     "search",
+    "prefix_search",
     "uses_na_format",
     "valid_station",
     "__LAST_UPDATED__",
@@ -0,0 +1,127 @@
+"""Built-in spatial index for station coordinate search.
+
+Used in place of scipy's KDTree when the scipy extra isn't installed. Points
+are unit sphere (ECEF) vectors bucketed into a uniform 3D grid. A query walks
+outward one shell of cells at a time and stops once no unvisited cell could
+hold a closer point, so results match a KDTree query on the same points.
+"""
+
+# stdlib
+from __future__ import annotations
+
+import heapq
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+Point = tuple[float, float, float]
+Cell = tuple[int, int, int]
+
+# Edge length of a grid cell in unit sphere distance (about 127 km)
+CELL_SIZE = 0.02
+
+
+@lru_cache(maxsize=64)
+def _shell(radius: int) -> tuple[Cell, ...]:
+    """Return cell offsets exactly `radius` cells away from the center cell."""
+    if radius == 0:
+        return ((0, 0, 0),)
+    offsets: list[Cell] = []
+    span = range(-radius, radius + 1)
+    for dx in span:
+        for dy in span:
+            if abs(dx) == radius or abs(dy) == radius:
+                offsets.extend((dx, dy, dz) for dz in span)
+            else:
+                offsets.extend(((dx, dy, -radius), (dx, dy, radius)))
+    return tuple(offsets)
+
+
+class GridIndex:
+    """Pure Python nearest neighbor index with a KDTree compatible query."""
+
+    n: int
+    _points: list[Point]
+    _cells: dict[Cell, list[int]]
+
+    def __init__(self, points: Sequence[Point], cell_size: float = CELL_SIZE):
+        self.n = len(points)
+        self.cell_size = cell_size
+        self._points = [(float(x), float(y), float(z)) for x, y, z in points]
+        self._cells = {}
+        for i, point in enumerate(self._points):
+            self._cells.setdefault(self._cell(point), []).append(i)
+
+    def _cell(self, point: Point) -> Cell:
+        x, y, z = point
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size), math.floor(z / size)
+
+    def _query_point(self, point: Point, k: int, bound: float) -> list[tuple[float, int]]:
+        """Return up to k sorted (distance, index) pairs closer than bound."""
+        px, py, pz = point
+        cx, cy, cz = self._cell(point)
+        # Max-heap of the best k matches using negative distances
+        best: list[tuple[float, int]] = []
+        # Every point is within distance 2 on the unit sphere
+        max_radius = math.ceil(min(bound, 2) / self.cell_size) + 1
+        for radius in range(max_radius + 1):
+            # Points in this shell can't be closer than this
+            if (radius - 1) * self.cell_size > (-best[0][0] if len(best) == k else bound):
+                break
+            for dx, dy, dz in _shell(radius):
+                for i in self._cells.get((cx + dx, cy + dy, cz + dz), ()):
+                    x, y, z = self._points[i]
+                    dist = math.sqrt((x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2)
+                    if dist >= bound:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, i))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, i))
+        return sorted((-dist, i) for dist, i in best)
+
+    def query(
+        self,
+        x: Any,
+        k: int = 1,
+        distance_upper_bound: float = math.inf,
+        workers: int = 1,  # noqa: ARG002
+    ) -> tuple[Any, Any]:
+        """Find the k nearest points to x matching KDTree.query output.
+
+        Missing neighbors are returned as an infinite distance and index n.
+        """
+        if len(x) and hasattr(x[0], "__len__"):
+            results = [self.query(point, k, distance_upper_bound) for point in x]
+            return [r[0] for r in results], [r[1] for r in results]
+        found = self._query_point(cast(Point, tuple(x)), k, distance_upper_bound)
+        found += [(math.inf, self.n)] * (k - len(found))
+        if k == 1:
+            return found[0]
+        return [f[0] for f in found], [f[1] for f in found]
+
+    def query_ball_point(self, x: Point, r: float) -> list[int]:
+        """Find the indexes of all points within distance r of x matching KDTree.query_ball_point."""
+        px, py, pz = x
+        cx, cy, cz = self._cell((px, py, pz))
+        max_radius = math.ceil(min(r, 2) / self.cell_size) + 1
+        # Large areas are cheaper to scan than to walk cell by cell
+        if (max_radius * 2 + 1) ** 3 > len(self._cells):
+            cells: Any = self._cells.values()
+        else:
+            cells = (
+                self._cells.get((cx + dx, cy + dy, cz + dz), ())
+                for radius in range(max_radius + 1)
+                for dx, dy, dz in _shell(radius)
+            )
+        found = []
+        for cell in cells:
+            for i in cell:
+                x1, y1, z1 = self._points[i]
+                if math.sqrt((x1 - px) ** 2 + (y1 - py) ** 2 + (z1 - pz) ** 2) <= r:
+                    found.append(i)
+        return found
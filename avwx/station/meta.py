@@ -6,21 +6,35 @@ from __future__ import annotations
 from functools import lru_cache
 
 # module
+from avwx.__about__ import __version__
 from avwx.exceptions import BadStation
-from avwx.load_utils import LazyLoad
+from avwx.load_utils import DiskCache
 from avwx.static.core import IN_REGIONS, M_IN_REGIONS, M_NA_REGIONS, NA_REGIONS
+from avwx.station.table import StationTable
 
 __LAST_UPDATED__ = "2024-06-12"
 
 # Lazy data loading to speed up import times for unused features
-STATIONS = LazyLoad("stations")
+# Memory-mapped table falls back to the JSON file if the table hasn't been built
+STATIONS = StationTable("stations")
+
+
+def _derived_key() -> str:
+    """Return the station data version that derived indexes were built from."""
+    source = STATIONS.source if STATIONS.source.exists() else STATIONS.source.with_suffix(".json")
+    stat = source.stat()
+    return f"{__version__}:{__LAST_UPDATED__}:{source.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+# Station indexes persisted between runs and rebuilt when the station data changes
+DERIVED_CACHE = DiskCache("stations", _derived_key)
 
 
 # maxsize = 2 ** number of boolean options
 @lru_cache(maxsize=2)
 def station_list(*, reporting: bool = True) -> list[str]:
     """Return a list of station idents matching the search criteria."""
-    return [code for code, station in STATIONS.items() if not reporting or station["reporting"]]
+    return [code for code, is_reporting in STATIONS.fields("reporting") if not reporting or is_reporting]
 
 
 def uses_na_format(station: str, default: bool | None = None) -> bool:
@@ -3,14 +3,17 @@
 # stdlib
 from __future__ import annotations
 
+import heapq
+import re
+from bisect import bisect_left
 from contextlib import suppress
 from functools import lru_cache
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 # module
 from avwx.exceptions import MissingExtraModule
-from avwx.load_utils import LazyCalc
-from avwx.station.meta import STATIONS
+from avwx.load_utils import CachedCalc
+from avwx.station.meta import DERIVED_CACHE, STATIONS
 from avwx.station.station import Station, station_filter
 
 if TYPE_CHECKING:
@@ -41,15 +44,78 @@ def _format_search(airport: dict, keys: Iterable[str]) -> str | None:
     return " - ".join(k for k in values if k)
 
 
-def _build_corpus() -> list[str]:
-    keys = ("icao", "iata", "gps", "local", "city", "state", "name")
-    return [text for s in STATIONS.values() if (text := _format_search(s, keys))]
+_SEARCH_FIELDS = ("icao", "iata", "gps", "local", "city", "state", "name", "type", "reporting")
 
 
-_CORPUS = LazyCalc(_build_corpus)
+def _build_corpus() -> dict[str, str]:
+    keys = _SEARCH_FIELDS[:7]
+    corpus = {}
+    for key, *values in STATIONS.fields(*keys):
+        if text := _format_search(dict(zip(keys, values, strict=True)), keys):
+            corpus[key] = text
+    return corpus
 
 
-def _sort_key(result: tuple[Station, int]) -> tuple[int, ...]:
+_CORPUS = CachedCalc(_build_corpus, DERIVED_CACHE, "corpus")
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class _SearchMeta(NamedTuple):
+    codes: tuple[str, ...]
+    type_order: int
+    is_airport: bool
+    reporting: bool
+    name: str
+
+
+class _PrefixIndex(NamedTuple):
+    tokens: list[str]
+    postings: list[tuple[str, ...]]
+    meta: dict[str, _SearchMeta]
+
+
+def _build_prefix_index() -> _PrefixIndex:
+    """Build a sorted token -> station keys inverted index over idents, names, and cities."""
+    postings: dict[str, set[str]] = {}
+    meta = {}
+    for key, icao, iata, gps, local, city, _, name, station_type, reporting in STATIONS.fields(*_SEARCH_FIELDS):
+        codes = tuple(c for c in (icao, iata, gps, local) if c)
+        for token in {*_tokenize(" ".join(codes)), *_tokenize(name or ""), *_tokenize(city or "")}:
+            postings.setdefault(token, set()).add(key)
+        try:
+            type_order = TYPE_ORDER.index(station_type)
+        except ValueError:
+            type_order = 10
+        meta[key] = _SearchMeta(codes, type_order, "airport" in (station_type or ""), reporting is True, name or "")
+    tokens = sorted(postings)
+    return _PrefixIndex(tokens, [tuple(postings[t]) for t in tokens], meta)
+
+
+_PREFIX_INDEX = CachedCalc(_build_prefix_index, DERIVED_CACHE, "prefix_index")
+
+
+def _prefix_matches(token: str, cap: int | None = None) -> set[str]:
+    """Return the station keys with any indexed token starting with the given text.
+
+    Stops early once there are more than cap matches.
+    """
+    index = _PREFIX_INDEX.value
+    matches: set[str] = set()
+    i = bisect_left(index.tokens, token)
+    while i < len(index.tokens) and index.tokens[i].startswith(token):
+        matches.update(index.postings[i])
+        if cap is not None and len(matches) > cap:
+            break
+        i += 1
+    return matches
+
+
+def _sort_key(result: tuple[Station, float]) -> tuple[float, ...]:
     station, score = result
     try:
         type_order = TYPE_ORDER.index(station.type)
@@ -58,6 +124,20 @@ def _sort_key(result: tuple[Station, int]) -> tuple[int, ...]:
     return (score, 10 - type_order)
 
 
+def _extract(text: str, corpus: dict[str, str], limit: int) -> list[tuple[str, float, str]]:
+    try:
+        return process.extract(
+            text,
+            corpus,
+            limit=limit * 20,
+            scorer=fuzz.token_set_ratio,
+            processor=utils.default_process,
+        )
+    except NameError as name_error:
+        extra = "fuzz"
+        raise MissingExtraModule(extra) from name_error
+
+
 @lru_cache(maxsize=128)
 def search(
     text: str,
@@ -70,18 +150,53 @@ def search(
 
     Results may be shorter than limit value.
     """
-    try:
-        results = process.extract(
-            text,
-            _CORPUS.value,
-            limit=limit * 20,
-            scorer=fuzz.token_set_ratio,
-            processor=utils.default_process,
-        )
-    except NameError as name_error:
-        extra = "fuzz"
-        raise MissingExtraModule(extra) from name_error
-    results = [(Station.from_code(k[:4]), s) for k, s, _ in results]
-    results.sort(key=_sort_key, reverse=True)
-    results = [s for s, _ in results if station_filter(s, is_airport=is_airport, reporting=sends_reports)]
-    return results[:limit] if len(results) > limit else results
+    corpus = _CORPUS.value
+    # Collecting and narrowing to a large share of the corpus costs more than it saves
+    cap = len(corpus) // 10
+    matches = [_prefix_matches(token, cap) for token in _tokenize(text)]
+    results = None
+    # Only fuzzy score stations sharing a token prefix if every word has some.
+    # A misspelled word has none and may only match the full corpus
+    if matches and all(matches) and len(candidates := set().union(*matches)) <= cap:
+        results = _extract(text, {key: corpus[key] for key in candidates if key in corpus}, limit)
+        if len(results) < limit:
+            results = None
+    if results is None:
+        results = _extract(text, corpus, limit)
+    stations = [(Station._from_code(key), s) for _, s, key in results]  # noqa: SLF001
+    stations.sort(key=_sort_key, reverse=True)
+    filtered = [s for s, _ in stations if station_filter(s, is_airport=is_airport, reporting=sends_reports)]
+    return filtered[:limit] if len(filtered) > limit else filtered
+
+
+def prefix_search(
+    text: str,
+    limit: int = 10,
+    *,
+    is_airport: bool = False,
+    sends_reports: bool = True,
+) -> list[Station]:
+    """Autocomplete search for stations by ident, name, and city prefixes.
+
+    Every word in the text must begin a word in one of the station's idents,
+    name, or city. Exact ident matches come first followed by larger airports.
+    This is fast enough to run on every keystroke and doesn't need the fuzz extra.
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        return []
+    matches = sorted((_prefix_matches(token) for token in tokens), key=len)
+    candidates = matches[0].intersection(*matches[1:])
+    meta = _PREFIX_INDEX.value.meta
+    ident = text.strip().upper()
+
+    def rank(key: str) -> tuple:
+        info = meta[key]
+        return ident not in info.codes, info.type_order, not info.reporting, info.name, key
+
+    keys = [
+        key
+        for key in candidates
+        if (meta[key].is_airport or not is_airport) and (meta[key].reporting or not sends_reports)
+    ]
+    return [Station._from_code(key) for key in heapq.nsmallest(limit, keys, key=rank)]  # noqa: SLF001
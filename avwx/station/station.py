@@ -3,27 +3,37 @@
 # stdlib
 from __future__ import annotations
 
-from contextlib import suppress
-from copy import copy
+import math
+from collections.abc import Sequence
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Any
+from functools import lru_cache, partial
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Protocol, TypeGuard, runtime_checkable
 
 # library
 import httpx
-from geopy.distance import Distance, great_circle  # type: ignore
+from geopy import units  # type: ignore
+from geopy.distance import EARTH_RADIUS, Distance, great_circle  # type: ignore
 
 # module
 from avwx.exceptions import BadStation, MissingExtraModule
-from avwx.load_utils import LazyCalc
-from avwx.station.meta import STATIONS
+from avwx.load_utils import CachedCalc, LazyCalc
+from avwx.station.grid import GridIndex
+from avwx.station.meta import DERIVED_CACHE, STATIONS
 from avwx.structs import Coord
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from functools import _CacheInfo
+
 try:
     from typing import Self
 except ImportError:
     from typing_extensions import Self
 
+# Max number of unique Station objects kept in the lookup cache
+STATION_CACHE_SIZE = 4096
+
 
 def _get_ip_location() -> Coord:
     """Return the current location according to ipinfo.io."""
@@ -31,7 +41,7 @@ def _get_ip_location() -> Coord:
     return Coord(float(lat), float(lon))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Runway:
     """Represent a runway at an airport."""
 
@@ -45,13 +55,39 @@ class Runway:
     bearing2: float
 
 
-_ICAO = LazyCalc(lambda: {v["icao"]: k for k, v in STATIONS.items() if v["icao"]})
-_IATA = LazyCalc(lambda: {v["iata"]: k for k, v in STATIONS.items() if v["iata"]})
-_GPS = LazyCalc(lambda: {v["gps"]: k for k, v in STATIONS.items() if v["gps"]})
-_LOCAL = LazyCalc(lambda: {v["local"]: k for k, v in STATIONS.items() if v["local"]})
+_CODE_TYPES = ("icao", "iata", "gps", "local")
+
+
+def _make_code_maps() -> dict[str, dict[str, str]]:
+    """Map each code type to its ident -> station key lookup in one pass."""
+    maps: dict[str, dict[str, str]] = {code_type: {} for code_type in _CODE_TYPES}
+    for key, *codes in STATIONS.fields(*_CODE_TYPES):
+        for code_type, code in zip(_CODE_TYPES, codes, strict=True):
+            if code:
+                maps[code_type][code] = key
+    return maps
+
+
+_CODE_MAPS = CachedCalc(_make_code_maps, DERIVED_CACHE, "code_maps")
+_ICAO = LazyCalc(lambda: _CODE_MAPS.value["icao"])
+_IATA = LazyCalc(lambda: _CODE_MAPS.value["iata"])
+_GPS = LazyCalc(lambda: _CODE_MAPS.value["gps"])
+_LOCAL = LazyCalc(lambda: _CODE_MAPS.value["local"])
 
 
-@dataclass
+def _make_ident_index() -> dict[str, str]:
+    """Map every ident to its station key using from_code lookup priority."""
+    index: dict[str, str] = {}
+    # Lowest priority first so higher priority idents overwrite
+    for source, length in ((_LOCAL, 0), (_IATA, 3), (_GPS, 4), (_ICAO, 4)):
+        index |= {ident: key for ident, key in source.value.items() if not length or len(ident) == length}
+    return index
+
+
+_IDENTS = CachedCalc(_make_ident_index, DERIVED_CACHE, "idents")
+
+
+@dataclass(frozen=True, slots=True)
 class Station:
     """
     The Station dataclass stores basic info about the desired station and
@@ -78,6 +114,9 @@ class Station:
     'Its longest runway is 04/22 at 7003 feet'
     ```
 
+    Stations are immutable, and lookups for the same ident return the same
+    cached object. Use `dataclasses.replace` to make a modified copy.
+
     This is also the same information you'd get from calling Report.station.
 
     ```python
@@ -101,40 +140,57 @@ class Station:
     name: str
     note: str | None
     reporting: bool
-    runways: list[Runway]
+    runways: tuple[Runway, ...] | None
     state: str | None
     type: str
     website: str | None
     wiki: str | None
 
     @classmethod
+    @lru_cache(maxsize=STATION_CACHE_SIZE)
     def _from_code(cls, ident: str) -> Self:
         try:
-            info: dict[str, Any] = copy(STATIONS[ident])
-            if info["runways"]:
-                info["runways"] = [Runway(**r) for r in info["runways"]]
-            return cls(**info)
+            info: dict[str, Any] = STATIONS[ident]
+            runways = info["runways"]
+            if runways is not None:
+                runways = tuple(Runway(**r) for r in runways)
+            return cls(**(info | {"runways": runways}))
         except (KeyError, AttributeError) as not_found:
             msg = f"Could not find station with ident {ident}"
             raise BadStation(msg) from not_found
 
+    @classmethod
+    def cache_info(cls) -> _CacheInfo:
+        """Hit, miss, and size statistics for the Station lookup cache."""
+        return cls._from_code.cache_info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Empty the Station lookup cache."""
+        cls._from_code.cache_clear()
+
     @classmethod
     def from_code(cls, ident: str) -> Self:
         """Load a Station from ICAO, GPS, or IATA code in that order."""
-        if ident and isinstance(ident, str):
-            if len(ident) == 4:
-                with suppress(BadStation):
-                    return cls.from_icao(ident)
-                with suppress(BadStation):
-                    return cls.from_gps(ident)
-            if len(ident) == 3:
-                with suppress(BadStation):
-                    return cls.from_iata(ident)
-            with suppress(BadStation):
-                return cls.from_local(ident)
+        if ident and isinstance(ident, str) and (key := _IDENTS.value.get(ident.upper())):
+            return cls._from_code(key)
         msg = f"Could not find station with ident {ident}"
         raise BadStation(msg)
 
+    @classmethod
+    def from_codes(cls, idents: Iterable[str]) -> list[Self | None]:
+        """Load Stations for many ICAO, GPS, or IATA codes at once.
+
+        Returns a list matching the order of the given idents with None for
+        any ident that could not be found. This does not raise BadStation.
+        """
+        index = _IDENTS.value
+        stations: list[Self | None] = []
+        for ident in idents:
+            key = index.get(ident.upper()) if ident and isinstance(ident, str) else None
+            stations.append(None if key is None else cls._from_code(key))
+        return stations
+
     @classmethod
     def from_icao(cls, ident: str) -> Self:
         """Load a Station from an ICAO station ident."""
@@ -184,8 +240,6 @@ class Station:
         """Load the Station nearest to your location or a lat,lon coordinate pair.
 
         Returns the Station and distances from source.
-
-        NOTE: Becomes less accurate toward poles and doesn't cross +/-180
         """
         if not (lat and lon):
             lat, lon = _get_ip_location().pair
@@ -242,10 +296,7 @@ class Station:
         sends_reports: bool = True,
         max_coord_distance: float = 10,
     ) -> list[tuple[Self, dict]]:
-        """Return Stations nearest to current station and their distances.
-
-        NOTE: Becomes less accurate toward poles and doesn't cross +/-180
-        """
+        """Return Stations nearest to current station and their distances."""
         stations = nearest(
             self.latitude,
             self.longitude,
@@ -262,40 +313,171 @@ class Station:
 # Coordinate search and resources
 
 
+def _to_xyz(lat: float, lon: float) -> tuple[float, float, float]:
+    """Convert a lat,lon coordinate to a point on the unit sphere (ECEF)."""
+    lat, lon = math.radians(lat), math.radians(lon)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def _arc_to_chord(degrees: float) -> float:
+    """Convert a great circle angle to the straight-line unit sphere distance."""
+    return 2 * math.sin(math.radians(min(degrees, 180)) / 2)
+
+
+def _chord_to_arc(chord: float) -> float:
+    """Convert a straight-line unit sphere distance to a great circle angle."""
+    return math.degrees(2 * math.asin(min(chord / 2, 1)))
+
+
 def _make_coords() -> list[tuple[str, float, float]]:
+    fields = ("icao", "gps", "iata", "local", "latitude", "longitude")
     return [
-        (
-            s["icao"] or s["gps"] or s["iata"] or s["local"],
-            s["latitude"],
-            s["longitude"],
-        )
-        for s in STATIONS.values()
+        (icao or gps or iata or local, lat, lon) for _, icao, gps, iata, local, lat, lon in STATIONS.fields(*fields)
     ]
 
 
-_COORDS = LazyCalc(_make_coords)
+_COORDS = CachedCalc(_make_coords, DERIVED_CACHE, "coords")
 
 
-def _make_coord_tree():  # type: ignore
+def _make_coord_filters() -> list[tuple[bool, bool]]:
+    """Return (is_airport, reporting) flags aligned with _COORDS."""
+    return [
+        ("airport" in (station_type or ""), reporting is True)
+        for _, station_type, reporting in STATIONS.fields("type", "reporting")
+    ]
+
+
+_COORD_FILTERS = CachedCalc(_make_coord_filters, DERIVED_CACHE, "coord_filters")
+
+
+def _build_tree(coords: list[tuple[str, float, float]]) -> Any:
+    """Return a KDTree if scipy is installed, else the built-in GridIndex."""
+    points = [_to_xyz(*c[1:]) for c in coords]
     try:
         from scipy.spatial import KDTree  # type: ignore
+    except ModuleNotFoundError:
+        return GridIndex(points)
+    return KDTree(points)
 
-        return KDTree([c[1:] for c in _COORDS.value])
-    except (NameError, ModuleNotFoundError) as name_error:
-        extra = "scipy"
-        raise MissingExtraModule(extra) from name_error
+
+def _make_coord_tree():  # type: ignore
+    return _build_tree(_COORDS.value)
 
 
-_COORD_TREE = LazyCalc(_make_coord_tree)
+# Part of cached tree names so installing or removing scipy rebuilds them
+_TREE_BACKEND = "kdtree" if find_spec("scipy") else "grid"
 
+_COORD_TREE = CachedCalc(_make_coord_tree, DERIVED_CACHE, f"coord_tree_{_TREE_BACKEND}")
 
-def _query_coords(lat: float, lon: float, n: int, d: float) -> list[tuple[str, float]]:
-    """Returns <= n number of ident, dist tuples <= d coord distance from lat,lon"""
-    dist, index = _COORD_TREE.value.query([lat, lon], n, distance_upper_bound=d)
+
+def _make_filtered_tree(*, is_airport: bool, reporting: bool) -> tuple[Any, list[int] | None]:
+    """Return a tree of only the stations matching the filter and their _COORDS indexes."""
+    if not (is_airport or reporting):
+        return _COORD_TREE.value, None
+    subset = [
+        i
+        for i, (airport, reports) in enumerate(_COORD_FILTERS.value)
+        if (airport or not is_airport) and (reports or not reporting)
+    ]
+    coords = _COORDS.value
+    return _build_tree([coords[i] for i in subset]), subset
+
+
+# Prebuilt trees per (is_airport, reporting) filter combination
+_FILTERED_TREES: dict[tuple[bool, bool], LazyCalc] = {
+    (airport, reports): CachedCalc(
+        partial(_make_filtered_tree, is_airport=airport, reporting=reports),
+        DERIVED_CACHE,
+        f"tree_{airport:d}{reports:d}_{_TREE_BACKEND}",
+    )
+    for airport in (True, False)
+    for reports in (True, False)
+}
+# The unfiltered tree is already cached as _COORD_TREE
+_FILTERED_TREES[False, False] = LazyCalc(lambda: (_COORD_TREE.value, None))
+
+
+def _query_coords(
+    lat: float, lon: float, n: int, d: float, *, is_airport: bool = False, reporting: bool = False
+) -> list[tuple[str, float]]:
+    """Returns <= n number of ident, dist tuples <= d great circle degrees from lat,lon"""
+    tree, subset = _FILTERED_TREES[is_airport, reporting].value
+    dist, index = tree.query(_to_xyz(lat, lon), n, distance_upper_bound=_arc_to_chord(d))
     if n == 1:
         dist, index = [dist], [index]
     # NOTE: index == len of list means Tree ran out of items
-    return [(_COORDS.value[i][0], d) for i, d in zip(index, dist, strict=True) if i < len(_COORDS.value)]
+    size = tree.n
+    coords = _COORDS.value
+    return [
+        (coords[i if subset is None else subset[i]][0], _chord_to_arc(d))
+        for i, d in zip(index, dist, strict=True)
+        if i < size
+    ]
+
+
+@dataclass(frozen=True)
+class NearestStations:
+    """Nearest station results for many coordinate pairs.
+
+    Each row of `index` and `nautical_miles` matches an input coordinate and
+    is sorted nearest first. Rows are padded with -1 and inf when fewer than n
+    stations are within range. Stations are only created when requested.
+    """
+
+    index: Any
+    nautical_miles: Any
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def idents(self, point: int) -> list[str]:
+        """Station idents found for the coordinate at a given position."""
+        coords = _COORDS.value
+        return [coords[i][0] for i in self.index[point] if i >= 0]
+
+    def stations(self, point: int) -> list[Station]:
+        """Stations found for the coordinate at a given position."""
+        return [stn for stn in Station.from_codes(self.idents(point)) if stn]
+
+
+def nearest_many(
+    lats: Any,
+    lons: Any,
+    n: int = 1,
+    *,
+    is_airport: bool = False,
+    sends_reports: bool = True,
+    max_coord_distance: float = 10,
+    workers: int = 1,
+) -> NearestStations:
+    """Find the nearest n stations to many lat,lon coordinate pairs at once.
+
+    Accepts sequences or NumPy arrays of equal length and runs a single
+    vectorized tree query. max_coord_distance is in great circle degrees.
+    Set workers to -1 to query using all CPUs. Requires numpy, and scipy for
+    the vectorized query.
+    """
+    try:
+        import numpy as np
+    except ModuleNotFoundError as name_error:
+        extra = "scipy"
+        raise MissingExtraModule(extra) from name_error
+
+    lats, lons = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+    points = np.column_stack((np.cos(lats) * np.cos(lons), np.cos(lats) * np.sin(lons), np.sin(lats)))
+    tree, subset = _FILTERED_TREES[is_airport, sends_reports].value
+    dist, index = tree.query(points, n, distance_upper_bound=_arc_to_chord(max_coord_distance), workers=workers)
+    dist, index = np.asarray(dist).reshape(len(points), n), np.asarray(index).reshape(len(points), n)
+    # NOTE: index == len of list means Tree ran out of items
+    missing = index >= tree.n
+    index = np.where(missing, 0, index)
+    if subset is not None:
+        index = np.asarray(subset, dtype=index.dtype)[index]
+    kilometers = 2 * np.arcsin(np.minimum(np.where(missing, 0, dist) / 2, 1)) * EARTH_RADIUS
+    return NearestStations(
+        index=np.where(missing, -1, index),
+        nautical_miles=np.where(missing, np.inf, units.nautical(kilometers=kilometers)),
+    )
 
 
 def station_filter(station: Station, *, is_airport: bool, reporting: bool) -> bool:
@@ -310,25 +492,123 @@ def _query_filter(
     lat: float, lon: float, n: int, d: float, *, is_airport: bool, reporting: bool
 ) -> list[tuple[Station, float]]:
     """Return <= n number of stations <= d distance from lat,lon matching the query params."""
-    k = n * 20
-    last = 0
-    stations: list[tuple[Station, float]] = []
-    while True:
-        nodes = _query_coords(lat, lon, k, d)[last:]
-        # Ran out of new stations
-        if not nodes:
-            return stations
-        for code, dist in nodes:
-            if not code:
-                continue
-            stn = Station.from_code(code)
-            if station_filter(stn, is_airport=is_airport, reporting=reporting):
-                stations.append((stn, dist))
-            # Reached the desired number of stations
-            if len(stations) >= n:
-                return stations
-        last = k
-        k += n * 100
+    nodes = _query_coords(lat, lon, n, d, is_airport=is_airport, reporting=reporting)
+    return [(Station.from_code(code), dist) for code, dist in nodes if code]
+
+
+# (min_lat, min_lon, max_lat, max_lon)
+BoundingBox = tuple[float, float, float, float]
+
+
+def _bbox_cap(bbox: BoundingBox) -> tuple[float, float, float]:
+    """Return the center lat,lon and great circle radius of a circle containing the box."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    width = (max_lon - min_lon) % 360 or (360 if max_lon != min_lon else 0)
+    lat, lon = (min_lat + max_lat) / 2, min_lon + width / 2
+    # The farthest point is a corner unless the box spans more than a hemisphere
+    if width > 180:
+        return lat, lon, 180
+    center = _to_xyz(lat, lon)
+    radius = max(
+        math.dist(center, _to_xyz(corner_lat, corner_lon))
+        for corner_lat in (min_lat, max_lat)
+        for corner_lon in (min_lon, max_lon)
+    )
+    return lat, lon, _chord_to_arc(radius) + 1e-9
+
+
+def _in_bbox(lat: float, lon: float, bbox: BoundingBox) -> bool:
+    min_lat, min_lon, max_lat, max_lon = bbox
+    if not min_lat <= lat <= max_lat:
+        return False
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    # Box crosses +/-180
+    return lon >= min_lon or lon <= max_lon
+
+
+class _Ring(Protocol):
+    coords: Iterable[Sequence[float]]
+
+
+@runtime_checkable
+class _Polygon(Protocol):
+    """Shapely-like polygon."""
+
+    @property
+    def bounds(self) -> BoundingBox: ...
+
+    @property
+    def exterior(self) -> _Ring: ...
+
+
+def _is_bbox(area: object) -> TypeGuard[BoundingBox]:
+    return isinstance(area, Sequence) and len(area) == 4 and all(isinstance(v, (int, float)) for v in area)
+
+
+def _in_polygon(lat: float, lon: float, poly: Sequence[tuple[float, float]]) -> bool:
+    """Ray casting point in polygon check treating lat,lon as a plane."""
+    inside = False
+    j = len(poly) - 1
+    for i, (lat_i, lon_i) in enumerate(poly):
+        lat_j, lon_j = poly[j]
+        if (lon_i > lon) != (lon_j > lon) and lat < (lat_j - lat_i) * (lon - lon_i) / (lon_j - lon_i) + lat_i:
+            inside = not inside
+        j = i
+    return inside
+
+
+def stations_within(
+    area: BoundingBox | Sequence[Coord | tuple[float, float]] | _Polygon,
+    *,
+    is_airport: bool = False,
+    sends_reports: bool = True,
+    as_stations: bool = False,
+) -> list[str] | list[Station]:
+    """Find all stations inside a bounding box or polygon.
+
+    The area can be a (min_lat, min_lon, max_lat, max_lon) bounding box which
+    may cross +/-180 if min_lon > max_lon, a list of Coords or lat,lon pairs,
+    or a shapely Polygon of lat,lon pairs like `AirSigObservation.poly`.
+    Polygon edges are treated as straight lines on a lat,lon plane.
+
+    Returns station idents unless as_stations is True.
+    """
+    poly: list[tuple[float, float]] | None = None
+    if isinstance(area, _Polygon):
+        min_lat, min_lon, max_lat, max_lon = area.bounds
+        bbox: BoundingBox = (min_lat, min_lon, max_lat, max_lon)
+        poly = [(c[0], c[1]) for c in area.exterior.coords]
+    elif _is_bbox(area):
+        min_lat, min_lon, max_lat, max_lon = area
+        bbox = (min_lat, min_lon, max_lat, max_lon)
+    else:
+        poly = []
+        for coord in area:
+            if isinstance(coord, Coord):
+                poly.append(coord.pair)
+            elif isinstance(coord, Sequence):
+                poly.append((coord[0], coord[1]))
+            else:
+                msg = "Area must be a bounding box, polygon coordinates, or a shapely Polygon"
+                raise TypeError(msg)
+        if len(poly) < 3:
+            msg = "Polygon area needs at least three coordinates"
+            raise ValueError(msg)
+        lats, lons = [c[0] for c in poly], [c[1] for c in poly]
+        bbox = (min(lats), min(lons), max(lats), max(lons))
+    lat, lon, radius = _bbox_cap(bbox)
+    tree, subset = _FILTERED_TREES[is_airport, sends_reports].value
+    index = tree.query_ball_point(_to_xyz(lat, lon), _arc_to_chord(radius))
+    coords = _COORDS.value
+    idents = []
+    for i in sorted(index if subset is None else (subset[j] for j in index)):
+        code, lat, lon = coords[i]
+        if code and _in_bbox(lat, lon, bbox) and (poly is None or _in_polygon(lat, lon, poly)):
+            idents.append(code)
+    if as_stations:
+        return [stn for stn in Station.from_codes(idents) if stn]
+    return idents
 
 
 def nearest(
@@ -342,31 +622,24 @@ def nearest(
 ) -> dict | list[dict]:
     """Find the nearest n Stations to a lat,lon coordinate pair.
 
-    Returns the Station and coordinate distance from source.
-
-    NOTE: Becomes less accurate toward poles and doesn't cross +/-180.
+    Returns the Station and distances from source sorted nearest first. The
+    coordinate distance and max_coord_distance are great circle degrees.
     """
-    # Default state includes all, no filtering necessary
-    if is_airport or sends_reports:
-        stations = _query_filter(lat, lon, n, max_coord_distance, is_airport=is_airport, reporting=sends_reports)
-    else:
-        data = _query_coords(lat, lon, n, max_coord_distance)
-        stations = [(Station.from_code(code), d) for code, d in data]
+    stations = _query_filter(lat, lon, n, max_coord_distance, is_airport=is_airport, reporting=sends_reports)
     if not stations:
         return []
     ret = []
     for station, coord_dist in stations:
-        dist = station.distance(lat, lon)
+        kilometers = math.radians(coord_dist) * EARTH_RADIUS
         ret.append(
             {
                 "station": station,
                 "coordinate_distance": coord_dist,
-                "nautical_miles": dist.nautical,
-                "miles": dist.miles,
-                "kilometers": dist.kilometers,
+                "nautical_miles": units.nautical(kilometers=kilometers),
+                "miles": units.miles(kilometers=kilometers),
+                "kilometers": kilometers,
             }
         )
     if n == 1:
         return ret[0]
-    ret.sort(key=lambda x: x["miles"])
     return ret
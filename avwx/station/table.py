@@ -0,0 +1,329 @@
+"""Compact binary station table.
+
+The station table is a read-only file of fixed-width station and runway
+records followed by a pool of deduplicated UTF-8 strings. Station records are
+sorted by station key so a single record can be found with a binary search
+against the memory-mapped file. Nothing is decoded until a station is
+requested, and forked worker processes share the same file-backed pages.
+
+Layout (little-endian):
+
+- Header: magic, format version, station count, runway count
+- Station records sorted by key
+- Runway records grouped by station
+- String pool
+"""
+
+# stdlib
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+# module
+from avwx.load_utils import LazyLoad
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MAGIC = b"AVWXSTN\x00"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHII")
+_NULL_STR = 0xFFFFFFFF
+_NULL_INT = -(2**31)
+_NULL_RUNWAYS = 0xFFFF
+_NULL_BOOL = 2
+
+# Order matters. Changing the field list or record formats requires a VERSION bump
+STRING_FIELDS = (
+    "city",
+    "country",
+    "gps",
+    "iata",
+    "icao",
+    "local",
+    "name",
+    "note",
+    "state",
+    "type",
+    "website",
+    "wiki",
+)
+
+NUMBER_FIELDS = ("latitude", "longitude", "elevation_ft", "elevation_m", "reporting")
+
+# key + string fields, latitude, longitude, elevation_ft, elevation_m, reporting, runway start, runway count
+_STATION = struct.Struct("<" + "IH" * (len(STRING_FIELDS) + 1) + "ddiiBIH")
+_NUMBERS_AT = (len(STRING_FIELDS) + 1) * 2
+# length_ft, width_ft, surface, lights, ident1, ident2, bearing1, bearing2
+_RUNWAY = struct.Struct("<iiIHBIHIHdd")
+
+
+class _StringPool:
+    """Deduplicated string pool used while writing a table."""
+
+    def __init__(self) -> None:
+        self._offsets: dict[str, int] = {}
+        self._data = bytearray()
+
+    def add(self, value: str | None) -> tuple[int, int]:
+        if value is None:
+            return _NULL_STR, 0
+        encoded = value.encode("utf8")
+        if value not in self._offsets:
+            self._offsets[value] = len(self._data)
+            self._data += encoded
+        return self._offsets[value], len(encoded)
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._data)
+
+
+def _int_or_null(value: int | None) -> int:
+    return _NULL_INT if value is None else int(value)
+
+
+def _float_or_nan(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _bool_or_null(value: bool | None) -> int:
+    return _NULL_BOOL if value is None else int(value)
+
+
+def write_table(stations: dict[str, dict], path: Path) -> None:
+    """Write a station dict to the binary table format.
+
+    The file is written next to the target and renamed into place so existing
+    memory maps of the old table remain valid.
+    """
+    pool = _StringPool()
+    records: list[bytes] = []
+    runways: list[bytes] = []
+    for key in sorted(stations):
+        station = stations[key]
+        strings: list[int] = [*pool.add(key)]
+        for field in STRING_FIELDS:
+            strings += pool.add(station.get(field))
+        rwy_start = len(runways)
+        station_runways = station.get("runways")
+        for runway in station_runways or []:
+            runways.append(
+                _RUNWAY.pack(
+                    _int_or_null(runway["length_ft"]),
+                    _int_or_null(runway["width_ft"]),
+                    *pool.add(runway["surface"]),
+                    _bool_or_null(runway["lights"]),
+                    *pool.add(runway["ident1"]),
+                    *pool.add(runway["ident2"]),
+                    _float_or_nan(runway["bearing1"]),
+                    _float_or_nan(runway["bearing2"]),
+                )
+            )
+        records.append(
+            _STATION.pack(
+                *strings,
+                float(station["latitude"]),
+                float(station["longitude"]),
+                _int_or_null(station.get("elevation_ft")),
+                _int_or_null(station.get("elevation_m")),
+                _bool_or_null(station.get("reporting")),
+                rwy_start,
+                _NULL_RUNWAYS if station_runways is None else len(station_runways),
+            )
+        )
+    temp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    with temp.open("wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, len(records), len(runways)))
+        out.writelines(records)
+        out.writelines(runways)
+        out.write(pool.data)
+    temp.replace(path)
+
+
+class StationTable:
+    """Lazy, memory-mapped station table with a read-only dict interface.
+
+    Falls back to the JSON station file if the binary table is not available.
+    """
+
+    source: Path
+    _map: mmap.mmap | None = None
+    _fallback: LazyLoad | None = None
+    _count: int = 0
+    _runways_at: int = 0
+    _strings_at: int = 0
+
+    def __init__(self, filename: str):
+        self.source = Path(__file__).parent.parent.joinpath("data", "files", f"{filename}.bin")
+        self._filename = filename
+
+    def _load(self) -> None:
+        try:
+            with self.source.open("rb") as fin:
+                data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            self._fallback = LazyLoad(self._filename)
+            return
+        magic, version, count, runway_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            data.close()
+            self._fallback = LazyLoad(self._filename)
+            return
+        self._map = data
+        self._count = count
+        self._runways_at = _HEADER.size + count * _STATION.size
+        self._strings_at = self._runways_at + runway_count * _RUNWAY.size
+
+    def _check(self) -> None:
+        if self._map is None and self._fallback is None:
+            self._load()
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether station data is served from the memory-mapped table."""
+        self._check()
+        return self._map is not None
+
+    def _string(self, offset: int, length: int) -> str | None:
+        if offset == _NULL_STR or self._map is None:
+            return None
+        start = self._strings_at + offset
+        return self._map[start : start + length].decode("utf8")
+
+    def _record(self, index: int) -> tuple:
+        return _STATION.unpack_from(self._map, _HEADER.size + index * _STATION.size)  # type: ignore
+
+    def _key(self, index: int) -> str:
+        offset, length = _STATION.unpack_from(self._map, _HEADER.size + index * _STATION.size)[:2]  # type: ignore
+        return self._string(offset, length) or ""
+
+    def _find(self, key: str) -> int | None:
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count and self._key(low) == key:
+            return low
+        return None
+
+    def _runway(self, index: int) -> dict[str, Any]:
+        values = _RUNWAY.unpack_from(self._map, self._runways_at + index * _RUNWAY.size)  # type: ignore
+        length, width, surface, surface_len, lights, id1, id1_len, id2, id2_len, bearing1, bearing2 = values
+        return {
+            "length_ft": None if length == _NULL_INT else length,
+            "width_ft": None if width == _NULL_INT else width,
+            "surface": self._string(surface, surface_len),
+            "lights": None if lights == _NULL_BOOL else bool(lights),
+            "ident1": self._string(id1, id1_len),
+            "ident2": self._string(id2, id2_len),
+            "bearing1": None if math.isnan(bearing1) else bearing1,
+            "bearing2": None if math.isnan(bearing2) else bearing2,
+        }
+
+    def _decode(self, record: tuple) -> dict[str, Any]:
+        strings, values = record[2:_NUMBERS_AT], record[_NUMBERS_AT:]
+        info: dict[str, Any] = {
+            field: self._string(strings[i * 2], strings[i * 2 + 1]) for i, field in enumerate(STRING_FIELDS)
+        }
+        lat, lon, elev_ft, elev_m, reporting, rwy_start, rwy_count = values
+        info["latitude"] = lat
+        info["longitude"] = lon
+        info["elevation_ft"] = None if elev_ft == _NULL_INT else elev_ft
+        info["elevation_m"] = None if elev_m == _NULL_INT else elev_m
+        info["reporting"] = None if reporting == _NULL_BOOL else bool(reporting)
+        if rwy_count == _NULL_RUNWAYS:
+            info["runways"] = None
+        else:
+            info["runways"] = [self._runway(i) for i in range(rwy_start, rwy_start + rwy_count)]
+        return info
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        self._check()
+        if self._fallback is not None:
+            return self._fallback[key]  # type: ignore
+        if not isinstance(key, str) or (index := self._find(key)) is None:
+            raise KeyError(key)
+        return self._decode(self._record(index))
+
+    def __contains__(self, key: str) -> bool:
+        self._check()
+        if self._fallback is not None:
+            return key in self._fallback
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __len__(self) -> int:
+        self._check()
+        if self._fallback is not None:
+            return len(self._fallback)
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        self._check()
+        if self._fallback is not None:
+            yield from self._fallback
+            return
+        for i in range(self._count):
+            yield self._key(i)
+
+    def items(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Iterate through (key, station info) pairs in key order."""
+        self._check()
+        if self._fallback is not None:
+            yield from self._fallback.items()
+            return
+        for i in range(self._count):
+            record = self._record(i)
+            yield self._string(*record[:2]) or "", self._decode(record)
+
+    def values(self) -> Iterator[dict[str, Any]]:
+        """Iterate through station info dicts in key order."""
+        for _, value in self.items():
+            yield value
+
+    def fields(self, *names: str) -> Iterator[tuple]:
+        """Iterate through (key, *values) for the named fields in key order.
+
+        Only the requested fields are decoded, which makes this much faster than
+        `items` when building indexes over the whole table.
+        """
+        self._check()
+        if self._fallback is not None:
+            for key, info in self._fallback.items():
+                yield key, *(info[name] for name in names)
+            return
+        strings = [(i, STRING_FIELDS.index(n) * 2 + 2) for i, n in enumerate(names) if n in STRING_FIELDS]
+        numbers = [(i, _NUMBERS_AT + NUMBER_FIELDS.index(n)) for i, n in enumerate(names) if n in NUMBER_FIELDS]
+        if len(strings) + len(numbers) != len(names):
+            msg = f"Unsupported table field in {names}"
+            raise KeyError(msg)
+        nulls = {"elevation_ft": _NULL_INT, "elevation_m": _NULL_INT, "reporting": _NULL_BOOL}
+        pool, start = self._map, self._strings_at
+        end = _HEADER.size + self._count * _STATION.size
+        records = memoryview(self._map)[_HEADER.size : end]  # type: ignore
+        values: list[Any] = [None] * len(names)
+        try:
+            for record in _STATION.iter_unpack(records):
+                for i, index in strings:
+                    offset = record[index]
+                    if offset == _NULL_STR:
+                        values[i] = None
+                    else:
+                        values[i] = pool[start + offset : start + offset + record[index + 1]].decode("utf8")  # type: ignore
+                for i, index in numbers:
+                    value = record[index]
+                    values[i] = None if value == nulls.get(names[i]) else value
+                    if names[i] == "reporting" and values[i] is not None:
+                        values[i] = bool(value)
+                yield self._string(*record[:2]), *values
+        finally:
+            records.release()
@@ -0,0 +1,10 @@
+"""Shared test fixtures."""
+
+# library
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep derived data caches out of the user's cache directory."""
+    monkeypatch.setenv("AVWX_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
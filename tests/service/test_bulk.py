@@ -1,14 +1,30 @@
 """Bulk Service Tests."""
 
+# stdlib
+from __future__ import annotations
+
+import asyncio as aio
+import gzip
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
 # library
 import pytest
 
 # module
+from avwx import Metar
+from avwx.exceptions import BadStation, SourceError
 from avwx.service import bulk
+from avwx.service.cache import RESPONSE_CACHE
 
 # tests
+from tests.util import LocalServer, Response
+
 from .test_base import ServiceClassTest
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 class BulkServiceTest(ServiceClassTest):
     """Test bulk downloads from NOAA file server."""
@@ -52,3 +68,187 @@ class TestIntlBulk(BulkServiceTest):
 
     service_class = bulk.NoaaIntl
     report_types = ("airsigmet",)
+
+
+CSV_HEADER = "No errors\nNo warnings\n5 ms\ndata source=metars\n2 results\nraw_text,station_id\n"
+
+
+class FeedRoute:
+    """Local CSV feed honoring conditional requests."""
+
+    def __init__(self) -> None:
+        self.version = 1
+
+    def __call__(self, headers: dict[str, str]) -> Response:
+        etag = f'"v{self.version}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        body = f"{CSV_HEADER}KJFK 0{self.version}0000Z,KJFK\nKLGA 0{self.version}0000Z,KLGA\n"
+        return 200, {"ETag": etag, "Last-Modified": "Sat, 17 Oct 2026 07:00:00 GMT"}, body.encode()
+
+
+@pytest.fixture
+def feed() -> Iterator[tuple[FeedRoute, LocalServer]]:
+    RESPONSE_CACHE.clear()
+    route = FeedRoute()
+    with LocalServer({"/metars.cache.csv": route}) as server:
+        yield route, server
+    RESPONSE_CACHE.clear()
+
+
+def _local_bulk(url: str, *, compressed: bool = False, **attrs: Any) -> bulk.NoaaBulk:
+    cls: type[bulk.NoaaBulk] = type("LocalBulk", (bulk.NoaaBulk,), {"_url": f"{url}/{{}}s.cache.csv", **attrs})
+    return cls("metar", compressed=compressed)
+
+
+def test_conditional_fetch(feed: tuple[FeedRoute, LocalServer]) -> None:
+    """Test unchanged feeds reuse the extracted reports."""
+    route, server = feed
+    service = _local_bulk(server.url)
+    first = service.fetch()
+    assert first == ["KJFK 010000Z", "KLGA 010000Z"]
+    assert service.fetch() == first
+    assert service.fetch(changed_only=True) is None
+    assert server.requests[1][2]["If-None-Match"] == '"v1"'
+    assert server.requests[1][2]["If-Modified-Since"] == "Sat, 17 Oct 2026 07:00:00 GMT"
+    # Other instances haven't seen this version yet
+    assert _local_bulk(server.url).fetch(changed_only=True) == first
+    route.version = 2
+    assert service.fetch(changed_only=True) == ["KJFK 020000Z", "KLGA 020000Z"]
+    assert len(server.requests) == 5
+
+
+def test_cache_ttl(feed: tuple[FeedRoute, LocalServer]) -> None:
+    """Test fresh responses are reused without a request."""
+    _, server = feed
+    service = _local_bulk(server.url, cache_ttl=60)
+    assert service.fetch() == service.fetch()
+    assert len(server.requests) == 1
+
+
+def test_cache_disabled(feed: tuple[FeedRoute, LocalServer]) -> None:
+    """Test every fetch downloads the feed without a cache."""
+    _, server = feed
+    service = _local_bulk(server.url, cache_ttl=None)
+    assert service.fetch() == service.fetch()
+    assert len(server.requests) == 2
+    assert all("If-None-Match" not in headers for *_, headers in server.requests)
+    assert len(RESPONSE_CACHE) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream(feed: tuple[FeedRoute, LocalServer]) -> None:
+    """Test streamed reports match fetched reports."""
+    _, server = feed
+    service = _local_bulk(server.url)
+    reports = [report async for report in service.stream()]
+    assert reports == ["KJFK 010000Z", "KLGA 010000Z"]
+    assert reports == await service.async_fetch()
+
+
+@pytest.mark.asyncio
+async def test_stream_quoted_rows() -> None:
+    """Test streamed rows follow CSV quoting rules."""
+    rows = ['"KJFK 281651Z RMK AO2, SLP339",KJFK', '"PIREP UA /OV\nOKC",KOKC', "", "KLGA 281651Z,KLGA"]
+    body = (CSV_HEADER + "\n".join(rows) + "\n").encode()
+    with LocalServer({"/metars.cache.csv": (200, {}, body)}) as server:
+        service = _local_bulk(server.url, cache_ttl=None)
+        reports = [report async for report in service.stream()]
+        assert reports == await service.async_fetch()
+    assert reports == ["KJFK 281651Z RMK AO2, SLP339", "PIREP UA /OV OKC", "KLGA 281651Z"]
+
+
+@pytest.mark.asyncio
+async def test_stream_error() -> None:
+    """Test streamed requests raise on bad status codes."""
+    with LocalServer({}) as server:
+        service = _local_bulk(server.url)
+        with pytest.raises(SourceError):
+            [report async for report in service.stream()]
+
+
+STATION_CSV = CSV_HEADER.replace("raw_text,station_id", "raw_text,station_id,observation_time") + (
+    "KJFK 281551Z 33019KT 10SM A3052,KJFK,2026-10-28T15:51:00Z\n"
+    "KJFK 281651Z 33021KT 10SM A3054,KJFK,2026-10-28T16:51:00Z\n"
+    "KLGA 281651Z 34015KT 10SM A3055,KLGA,2026-10-28T16:51:00Z\n"
+)
+
+
+@pytest.fixture
+def station_feed() -> Iterator[LocalServer]:
+    RESPONSE_CACHE.clear()
+    with LocalServer({"/metars.cache.csv": (200, {"ETag": '"v1"'}, STATION_CSV.encode())}) as server:
+        yield server
+    RESPONSE_CACHE.clear()
+
+
+def _local_station_bulk(url: str, **kwargs: Any) -> bulk.NoaaBulkStation:
+    cls: type[bulk.NoaaBulkStation] = type(
+        "LocalBulkStation", (bulk.NoaaBulkStation,), {"_url": f"{url}/{{}}s.cache.csv"}
+    )
+    return cls("metar", **kwargs)
+
+
+def test_bulk_station_fetch(station_feed: LocalServer) -> None:
+    """Test station reports are served from one download."""
+    service = _local_station_bulk(station_feed.url)
+    assert service.is_outdated
+    assert service.fetch("KJFK") == "KJFK 281651Z 33021KT 10SM A3054"
+    assert service.fetch("KLGA") == "KLGA 281651Z 34015KT 10SM A3055"
+    assert service.fetch("KEWR") == ""
+    assert not service.is_outdated
+    assert service.last_updated is not None
+    # Index is shared by new instances
+    assert _local_station_bulk(station_feed.url).fetch("KJFK").startswith("KJFK")
+    assert len(station_feed.requests) == 1
+    with pytest.raises(BadStation):
+        service.fetch("12K")
+
+
+@pytest.mark.asyncio
+async def test_bulk_station_refresh(station_feed: LocalServer) -> None:
+    """Test the index refreshes once per update interval."""
+    service = _local_station_bulk(station_feed.url)
+    reports = await aio.gather(*(service.async_fetch(code) for code in ("KJFK", "KLGA") * 5))
+    assert reports[:2] == ["KJFK 281651Z 33021KT 10SM A3054", "KLGA 281651Z 34015KT 10SM A3055"]
+    assert len(station_feed.requests) == 1
+    assert await service.update() is False
+    service.update_interval = timedelta(0)
+    assert await service.update() is True
+    assert len(station_feed.requests) == 2
+    assert station_feed.requests[-1][2]["If-None-Match"] == '"v1"'
+
+
+def test_bulk_station_types() -> None:
+    """Test the station service only accepts station report types and doesn't stream."""
+    assert not isinstance(bulk.NoaaBulkStation("taf"), bulk.NoaaBulk)
+    assert not hasattr(bulk.NoaaBulkStation, "stream")
+    with pytest.raises(ValueError, match="not a valid report type"):
+        bulk.NoaaBulkStation("airsigmet")
+
+
+def test_bulk_station_metar(station_feed: LocalServer) -> None:
+    """Test report classes can update from the station index."""
+    metar = Metar("KJFK")
+    metar.service = _local_station_bulk(station_feed.url)
+    assert metar.update() is True
+    assert metar.raw == "KJFK 281651Z 33021KT 10SM A3054"
+    assert metar.data is not None
+
+
+@pytest.mark.asyncio
+async def test_compressed_fetch() -> None:
+    """Test gzip files are decompressed for fetch and stream."""
+    body = (CSV_HEADER + "".join(f"K{i:03} 281651Z,K{i:03}\n" for i in range(500))).encode()
+    routes: dict[str, Response] = {
+        "/metars.cache.csv": (200, {}, body),
+        "/metars.cache.csv.gz": (200, {}, gzip.compress(body)),
+    }
+    with LocalServer(routes) as server:
+        plain = await _local_bulk(server.url, cache_ttl=None).async_fetch()
+        service = _local_bulk(server.url, cache_ttl=None, compressed=True)
+        assert await service.async_fetch() == plain
+        assert [report async for report in service.stream()] == plain
+        assert server.requests[-1][1] == "/metars.cache.csv.gz"
+    assert len(plain) == 500
+    assert plain[0] == "K000 281651Z"
@@ -0,0 +1,90 @@
+"""Shared HTTP pool tests."""
+
+# stdlib
+import asyncio as aio
+from importlib.util import find_spec
+
+# library
+import pytest
+
+# module
+from avwx import service
+from avwx.exceptions import MissingExtraModule
+from avwx.service.base import CallsHTTP
+from avwx.service.client import get_pool
+from tests.util import LocalServer, Response
+
+ROUTES: dict[str, Response] = {"/report": (200, {}, b"KJFK 281651Z 33021G25KT")}
+
+
+class LocalCall(CallsHTTP):
+    pass
+
+
+async def _fetch(url: str, count: int) -> list[str]:
+    return [await LocalCall()._call(f"{url}/report") for _ in range(count)]
+
+
+def test_no_pool() -> None:
+    """Test each request opens a new connection without a pool."""
+    assert get_pool() is None
+    with LocalServer(ROUTES) as server:
+        reports = aio.run(_fetch(server.url, 3))
+    assert reports == ["KJFK 281651Z 33021G25KT"] * 3
+    assert server.connections == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_pool() -> None:
+    """Test requests reuse pooled connections."""
+    with LocalServer(ROUTES) as server:
+        async with service.open() as pool:
+            assert get_pool() is pool
+            assert service.open() is pool
+            reports = await _fetch(server.url, 5)
+        assert get_pool() is None
+    assert reports == ["KJFK 281651Z 33021G25KT"] * 5
+    assert server.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_lifecycle() -> None:
+    """Test explicit open and close."""
+    pool = service.open(max_connections=10, max_per_host=2)
+    try:
+        assert pool.is_open
+        assert pool.client() is not None
+        assert pool.host_limit("https://example.com/a") is pool.host_limit("https://example.com/b")
+    finally:
+        await service.aclose()
+    assert not pool.is_open
+    assert pool.client() is None
+    assert get_pool() is None
+
+
+def test_pool_other_loop() -> None:
+    """Test requests from another event loop use their own client."""
+    loop = aio.new_event_loop()
+    try:
+        pool = loop.run_until_complete(_open())
+        with LocalServer(ROUTES) as server:
+            aio.run(_fetch(server.url, 2))
+        assert server.connections == 2
+        assert pool.is_open
+    finally:
+        loop.run_until_complete(service.aclose())
+        loop.close()
+
+
+async def _open() -> service.HTTPPool:
+    return service.open()
+
+
+@pytest.mark.asyncio
+async def test_http2_extra() -> None:
+    """Test HTTP/2 requires the http2 extra."""
+    if find_spec("h2") is not None:
+        pytest.skip("h2 is installed")
+    with pytest.raises(MissingExtraModule):
+        service.open(http2=True)
+    assert get_pool() is None
@@ -2,6 +2,20 @@
 
 # ruff: noqa: SLF001
 
+# stdlib
+import asyncio as aio
+import datetime as dt
+import io
+import json
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import count
+from pathlib import Path
+
 # library
 import pytest
 
@@ -9,6 +23,8 @@ import pytest
 from avwx import exceptions, service
 
 # tests
+from tests.util import LocalServer, Response
+
 from .test_base import ServiceClassTest, ServiceFetchTest
 
 
@@ -63,3 +79,422 @@ def test_nbm_all() -> None:
 # class TestGFS(ServiceFetchTest):
 #     service_class = service.NOAA_GFS
 #     report_type = "mav"
+
+
+def _nbm_file(report_type: str) -> tuple[bytes, dict[str, str]]:
+    reports = {}
+    for path in sorted(Path(__file__).parent.parent.joinpath("forecast", "data", report_type).glob("*.json")):
+        reports[path.stem] = json.loads(path.read_text())["data"]["raw"]
+    return "\n \n".join(f" {report}" for report in reports.values()).encode() + b"\n", reports
+
+
+_LOCAL_IDS = count()
+
+
+def _downloads(server: LocalServer) -> list[str]:
+    return [path for method, path, _ in server.requests if method == "GET"]
+
+
+def _local_nbm(url: str, report_type: str = "nbs") -> service.NoaaNbm:
+    # Unique class names keep each service's managed files separate
+    cls: type[service.NoaaNbm] = type(
+        f"LocalNbm{next(_LOCAL_IDS)}", (service.NoaaNbm,), {"_urls": property(lambda _: iter([url]))}
+    )
+    return cls(report_type)
+
+
+@pytest.mark.parametrize("report_type", ["nbs", "nbh", "nbe", "nbx"])
+def test_file_index(report_type: str) -> None:
+    """Test indexed station lookups match extracting from the full file."""
+    data, reports = _nbm_file(report_type)
+    serv = _local_nbm("", report_type)
+    offsets = serv._index_file(data)
+    assert sorted(offsets) == sorted(reports)
+    text = data.decode()
+    for station, (start, end) in offsets.items():
+        report = serv._extract_report(station, data[start:end].decode())
+        assert report == serv._extract(station, io.StringIO(text))
+        assert report == reports[station]
+
+
+@pytest.mark.asyncio
+async def test_indexed_fetch() -> None:
+    """Test stations are served from the index built after download."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        assert await serv.update() is True
+        file = serv._state.file
+        assert file is not None
+        assert file.offsets is not None
+        for station, report in reports.items():
+            assert await serv.async_fetch(station) == report
+        assert await serv.async_fetch("KLAX") is None
+        assert len(_downloads(server)) == 1
+
+
+def _slow_route(data: bytes, delay: float = 0.2) -> Callable[[dict[str, str]], Response]:
+    def route(_: dict[str, str]) -> Response:
+        time.sleep(delay)
+        return 200, {}, data
+
+    return route
+
+
+@pytest.mark.asyncio
+async def test_concurrent_update() -> None:
+    """Test concurrent fetches wait on a single download."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _slow_route(data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        results = await aio.gather(*(serv.async_fetch(station) for station in list(reports) * 50))
+        assert results == list(reports.values()) * 50
+        assert len(_downloads(server)) == 1
+        assert serv._updating is False
+
+
+@pytest.mark.asyncio
+async def test_update_no_wait() -> None:
+    """Test update returns immediately if the file is already updating."""
+    data, _ = _nbm_file("nbs")
+    with LocalServer({"/nbs": _slow_route(data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        task = aio.create_task(serv.update())
+        await aio.sleep(0.05)
+        assert serv._updating is True
+        assert await serv.update() is False
+        assert await serv.update(wait=True) is True
+        assert await task is True
+        assert len(_downloads(server)) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_per_report_type() -> None:
+    """Test files of different report types update independently."""
+    nbs, _ = _nbm_file("nbs")
+    nbh, _ = _nbm_file("nbh")
+    with LocalServer({"/nbs": _slow_route(nbs), "/nbh": _slow_route(nbh)}) as server:
+        serv_nbs = _local_nbm(f"{server.url}/nbs", "nbs")
+        serv_nbh = _local_nbm(f"{server.url}/nbh", "nbh")
+        task = aio.create_task(serv_nbs.update())
+        await aio.sleep(0.05)
+        assert serv_nbh._updating is False
+        assert await serv_nbh.update() is True
+        assert await task is True
+        assert len(_downloads(server)) == 2
+
+
+def test_threaded_update() -> None:
+    """Test sync fetches from several threads share one download."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _slow_route(data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(serv.fetch, list(reports) * 4))
+        assert results == list(reports.values()) * 4
+        assert len(_downloads(server)) == 1
+
+
+@pytest.mark.parametrize(("max_per_host", "limit"), [(None, 4), (2, 2)])
+@pytest.mark.asyncio
+async def test_newest_url_probe(max_per_host: int | None, limit: int) -> None:
+    """Test candidate files are probed concurrently and only the newest is downloaded.
+
+    An open pool's per-host limit also applies to the probes.
+    """
+    data, reports = _nbm_file("nbs")
+    lock = threading.Lock()
+    active, peak = 0, 0
+
+    def route(status: int, body: bytes = b"") -> Callable[[dict[str, str]], Response]:
+        def handler(_: dict[str, str]) -> Response:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return status, {}, body
+
+        return handler
+
+    # Hours 0-2 haven't been published. 3 and 5 have
+    routes = {f"/{hour}": route(200 if hour in (3, 5) else 404, data) for hour in range(10)}
+    with LocalServer(routes) as server:
+        serv = _local_nbm("")
+        urls = [f"{server.url}/{hour}" for hour in range(10)]
+        type(serv)._urls = property(lambda _: iter(urls))  # type: ignore
+        serv.probe_concurrency = 4
+        async with service.open(max_per_host=max_per_host) if max_per_host else nullcontext():
+            assert await serv.update() is True
+        assert await serv.async_fetch(next(iter(reports))) == next(iter(reports.values()))
+        downloads = _downloads(server)
+        probes = {path for method, path, _ in server.requests if method == "HEAD"}
+        assert downloads == ["/3"]
+        assert {"/0", "/1", "/2", "/3"} <= probes
+        assert 1 < peak <= limit
+
+
+@pytest.mark.asyncio
+async def test_newest_url_missing() -> None:
+    """Test update fails without downloading if no candidate exists."""
+    with LocalServer({}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        assert await serv.update() is False
+        assert [method for method, *_ in server.requests] == ["HEAD"]
+
+
+@pytest.mark.asyncio
+async def test_newest_url_no_head() -> None:
+    """Test candidates are probed with GET if the server doesn't allow HEAD."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({}) as server:
+        server.routes["/nbs"] = lambda _: (405, {}, b"") if server.requests[-1][0] == "HEAD" else (200, {}, data)
+        serv = _local_nbm(f"{server.url}/nbs")
+        assert await serv.update() is True
+        assert [method for method, *_ in server.requests] == ["HEAD", "GET", "GET"]
+        assert await serv.async_fetch("KJFK") == reports["KJFK"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_without_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test fetching from a fresh file uses the stored file state."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        assert await serv.update() is True
+        assert serv.last_updated is not None
+        assert serv.is_outdated is False
+
+        def no_scan(*_: object) -> None:
+            raise AssertionError
+
+        monkeypatch.setattr(Path, "glob", no_scan)
+        monkeypatch.setattr(Path, "open", no_scan)
+        for station, report in reports.items():
+            assert await serv.async_fetch(station) == report
+        assert serv.all
+
+
+@pytest.mark.asyncio
+async def test_update_replaces_file() -> None:
+    """Test each update maps a new file and deletes the old one."""
+    data, reports = _nbm_file("nbs")
+    station, report = next(iter(reports.items()))
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        assert await serv.update() is True
+        old_path = serv._file
+        assert old_path is not None
+        # Updating again within the same second still gets a new file
+        assert await serv.update() is True
+        assert serv._file not in (None, old_path)
+        assert not old_path.exists()
+        assert await serv.async_fetch(station) == report
+
+
+@pytest.mark.asyncio
+async def test_shared_dir(tmp_path: Path) -> None:
+    """Test processes sharing a directory reuse a fresh download."""
+    data, reports = _nbm_file("nbs")
+    station, report = next(iter(reports.items()))
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        type(serv).shared_dir = tmp_path
+        assert await serv.async_fetch(station) == report
+        path = serv._file
+        assert path == tmp_path / f"{serv._file_stem}.txt"
+        # Another process starts without any file state
+        service.files._STATES.pop(serv._file_stem)
+        assert serv.last_updated is None
+        assert await serv.async_fetch(station) == report
+        assert serv._file == path
+        assert len(_downloads(server)) == 1
+        # Outdated shared files are replaced in place
+        serv.update_interval = dt.timedelta(0)
+        service.files._STATES.pop(serv._file_stem)
+        assert await serv.update() is True
+        assert serv._file == path
+        assert path.exists()
+        assert len(_downloads(server)) == 2
+        stem = serv._file_stem
+        assert sorted(p.name for p in tmp_path.iterdir()) == [f"{stem}.lock", f"{stem}.txt"]
+
+
+@pytest.mark.skipif(service.files.fcntl is None, reason="Requires fcntl")
+@pytest.mark.asyncio
+async def test_shared_dir_lock(tmp_path: Path) -> None:
+    """Test an update waits for another process and reads its file."""
+    import fcntl
+
+    data, reports = _nbm_file("nbs")
+    station, report = next(iter(reports.items()))
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        type(serv).shared_dir = tmp_path
+        # Another process holds the lock while it downloads
+        with (tmp_path / f"{serv._file_stem}.lock").open("w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            task = aio.create_task(serv.async_fetch(station))
+            await aio.sleep(0.1)
+            assert not task.done()
+            (tmp_path / f"{serv._file_stem}.txt").write_bytes(data)
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        assert await task == report
+        assert _downloads(server) == []
+
+
+@pytest.mark.asyncio
+async def test_streamed_download() -> None:
+    """Test large files are written to disk without holding the body in memory."""
+    data, reports = _nbm_file("nbs")
+    # About 8 MB with the same stations repeated
+    data *= 8_000_000 // len(data)
+    station, report = next(iter(reports.items()))
+    with LocalServer({"/nbs": (200, {}, data)}) as server:
+        serv = _local_nbm(f"{server.url}/nbs")
+        tracemalloc.start()
+        try:
+            assert await serv.update() is True
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < len(data) // 4
+        assert serv._file is not None
+        assert serv._file.stat().st_size == len(data)
+        assert await serv.async_fetch(station) == report
+
+
+@pytest.mark.asyncio
+async def test_failed_download(tmp_path: Path) -> None:
+    """Test a failed download leaves no partial file behind."""
+    with LocalServer({}) as server:
+        # The probe finds the file but the download fails
+        server.routes["/nbs"] = lambda _: (200 if len(server.requests) == 1 else 500, {}, b"")
+        serv = _local_nbm(f"{server.url}/nbs")
+        type(serv).shared_dir = tmp_path
+        assert await serv.update() is False
+        assert serv._file is None
+        assert sorted(p.name for p in tmp_path.iterdir()) == [f"{serv._file_stem}.lock"]
+
+
+def _range_route(data: bytes, *, ranges: bool = True) -> Callable[[dict[str, str]], Response]:
+    """Serve byte ranges like the NOAA file server."""
+
+    def route(headers: dict[str, str]) -> Response:
+        value = {key.lower(): value for key, value in headers.items()}.get("range")
+        if not ranges or value is None:
+            return 200, {}, data
+        start, end = (int(i) for i in value.removeprefix("bytes=").split("-"))
+        part = data[start : end + 1]
+        return 206, {"Content-Range": f"bytes {start}-{start + len(part) - 1}/{len(data)}"}, part
+
+    return route
+
+
+def _range_requests(server: LocalServer) -> list[str]:
+    return [headers[key] for method, _, headers in server.requests for key in headers if key.lower() == "range"]
+
+
+@pytest.mark.parametrize(
+    ("ranges", "gap", "merged"),
+    [
+        ([], 0, []),
+        ([(0, 10), (20, 30)], 0, [(0, 10), (20, 30)]),
+        ([(0, 10), (20, 30)], 10, [(0, 30)]),
+        ([(0, 10), (5, 15), (40, 50)], 0, [(0, 15), (40, 50)]),
+        ([(0, 100), (10, 20)], 0, [(0, 100)]),
+    ],
+)
+def test_merge_ranges(ranges: list, gap: int, merged: list) -> None:
+    """Test nearby byte ranges are merged into one request."""
+    assert service.files._merge_ranges(ranges, gap) == merged
+
+
+@pytest.mark.parametrize(("gap", "count"), [(0, 2), (32 * 1024, 1)])
+@pytest.mark.asyncio
+async def test_station_ranges(gap: int, count: int) -> None:
+    """Test a service with selected stations only downloads their reports."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _range_route(data)}) as server:
+        full = _local_nbm(f"{server.url}/nbs")
+        # The first full download provides station offsets
+        assert await full.update() is True
+        serv = type(full)("nbs", stations=["KJFK", "PHNL"])
+        serv.range_gap = gap
+        assert serv._file_stem != full._file_stem
+        assert await serv.update() is True
+        assert len(_downloads(server)) == 1 + count
+        assert len(_range_requests(server)) == count
+        for station in ("KJFK", "PHNL"):
+            assert await serv.async_fetch(station) == reports[station]
+        assert await serv.async_fetch("KMCO") is None
+        assert (path := serv._file) is not None
+        assert path.stat().st_size < len(data)
+
+
+@pytest.mark.asyncio
+async def test_station_ranges_changed() -> None:
+    """Test the full file is downloaded if report offsets have changed."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _range_route(data)}) as server:
+        full = _local_nbm(f"{server.url}/nbs")
+        assert await full.update() is True
+        first = full._state.file
+        assert first is not None
+        assert first.offsets is not None
+        # The next file has an extra line before the first report
+        server.routes["/nbs"] = _range_route(b"\n" + data)
+        serv = type(full)("nbs", stations=["KMCO"])
+        assert await serv.update() is True
+        assert len(_range_requests(server)) == 1
+        assert _downloads(server)[-1] == "/nbs"
+        assert await serv.async_fetch("KMCO") == reports["KMCO"]
+        # The full file offsets are used next time
+        assert service.NoaaNbm._layouts[serv._layout_key]["KMCO"][0] == first.offsets["KMCO"][0] + 1
+
+
+@pytest.mark.asyncio
+async def test_station_ranges_unsupported() -> None:
+    """Test the full file is used if the server ignores ranges."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _range_route(data, ranges=False)}) as server:
+        full = _local_nbm(f"{server.url}/nbs")
+        assert await full.update() is True
+        serv = type(full)("nbs", stations=["KJFK"])
+        assert await serv.update() is True
+        assert len(_downloads(server)) == 3
+        assert await serv.async_fetch("KJFK") == reports["KJFK"]
+        assert await serv.async_fetch("KMCO") == reports["KMCO"]
+
+
+@pytest.mark.asyncio
+async def test_station_ranges_rejected() -> None:
+    """Test the full file is downloaded if the server rejects the range."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _range_route(data)}) as server:
+        full = _local_nbm(f"{server.url}/nbs")
+        assert await full.update() is True
+        server.routes["/nbs"] = lambda headers: (416, {}, b"") if "Range" in headers else (200, {}, data)
+        serv = type(full)("nbs", stations=["KJFK"])
+        assert await serv.update() is True
+        assert len(_range_requests(server)) == 1
+        assert len(_downloads(server)) == 3
+        assert await serv.async_fetch("KJFK") == reports["KJFK"]
+
+
+@pytest.mark.asyncio
+async def test_station_ranges_new_station() -> None:
+    """Test a station missing from the last file's offsets refreshes the full file."""
+    data, reports = _nbm_file("nbs")
+    with LocalServer({"/nbs": _range_route(data)}) as server:
+        full = _local_nbm(f"{server.url}/nbs")
+        assert await full.update() is True
+        del service.NoaaNbm._layouts[full._layout_key]["PHNL"]
+        serv = type(full)("nbs", stations=["KJFK", "PHNL"])
+        assert await serv.update() is True
+        assert not _range_requests(server)
+        assert await serv.async_fetch("PHNL") == reports["PHNL"]
+        # The refreshed offsets include the station again
+        assert "PHNL" in service.NoaaNbm._layouts[full._layout_key]
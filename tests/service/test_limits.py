@@ -0,0 +1,82 @@
+"""Service rate limit tests."""
+
+# ruff: noqa: SLF001
+
+# stdlib
+import asyncio as aio
+import time
+
+# library
+import pytest
+
+# module
+from avwx.service.base import CallsHTTP
+from avwx.service.limits import HostLimiter, TokenBucket, host_limiter
+from tests.util import LocalServer
+
+
+def test_token_bucket_burst() -> None:
+    """Test requests up to the burst size don't wait."""
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+
+@pytest.mark.parametrize(("rate", "burst"), [(0, 1), (-1, 1), (1, 0)])
+def test_token_bucket_bad_values(rate: float, burst: int) -> None:
+    """Test invalid bucket settings."""
+    with pytest.raises(ValueError, match="positive"):
+        TokenBucket(rate, burst)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate() -> None:
+    """Test acquire holds requests to the sustained rate."""
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    await aio.gather(*(bucket.acquire() for _ in range(6)))
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_host_concurrency() -> None:
+    """Test no more than the concurrency limit run at once."""
+    limiter = HostLimiter(concurrency=2)
+    running, peak = 0, 0
+
+    async def request() -> None:
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await aio.sleep(0.01)
+            running -= 1
+
+    await aio.gather(*(request() for _ in range(8)))
+    assert peak == 2
+
+
+def test_host_limiter_shared() -> None:
+    """Test limiters are shared per host and settings."""
+    limiter = host_limiter("https://example.com/a", 5, 5, 4)
+    assert host_limiter("https://example.com/b?c=1", 5, 5, 4) is limiter
+    assert host_limiter("https://example.org/a", 5, 5, 4) is not limiter
+    assert host_limiter("https://example.com/a", 1, 5, 4) is not limiter
+    assert host_limiter("https://example.com/a", None).bucket is None
+
+
+@pytest.mark.asyncio
+async def test_call_rate_limit() -> None:
+    """Test service requests wait on the host rate limit."""
+
+    class Limited(CallsHTTP):
+        rate_limit = 20
+        host_concurrency = 1
+
+    with LocalServer({"/": (200, {}, b"ok")}) as server:
+        start = time.monotonic()
+        await aio.gather(*(Limited()._call(server.url) for _ in range(5)))
+        elapsed = time.monotonic() - start
+    assert len(server.requests) == 5
+    assert elapsed >= 0.19
@@ -0,0 +1,141 @@
+"""Service retry and circuit breaker tests."""
+
+# ruff: noqa: SLF001
+
+# stdlib
+import asyncio as aio
+import time
+
+# library
+import pytest
+
+# module
+from avwx.exceptions import SourceError
+from avwx.service.base import CallsHTTP
+from avwx.service.retry import CircuitBreaker, RetryPolicy, circuit_breaker
+from tests.util import LocalServer
+
+
+def test_retry_backoff() -> None:
+    """Test delays grow exponentially up to the max delay."""
+    policy = RetryPolicy(backoff=0.5, multiplier=2, max_delay=3, jitter=0)
+    assert [policy.delay(i) for i in range(1, 5)] == [0.5, 1, 2, 3]
+
+
+def test_retry_jitter() -> None:
+    """Test jitter randomizes delays below the backoff."""
+    policy = RetryPolicy(backoff=1, jitter=0.5)
+    delays = {policy.delay(1) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(0.5 <= delay <= 1 for delay in delays)
+
+
+def test_retry_limits() -> None:
+    """Test retries stop after the attempts or elapsed time."""
+    policy = RetryPolicy(attempts=3, backoff=1, jitter=0, max_elapsed=2.5)
+    now = time.monotonic()
+    assert policy.next_delay(1, now) == 1
+    # One second already spent waiting before the next delay of two
+    assert policy.next_delay(2, now - 1) is None
+    assert policy.next_delay(3, now - 10) is None
+    assert RetryPolicy(attempts=3, backoff=1, jitter=0).next_delay(2, now) == 2
+
+
+def test_circuit_breaker() -> None:
+    """Test the circuit opens after failures and half-opens after the reset time."""
+    breaker = CircuitBreaker(threshold=2, reset=0.05)
+    breaker.record(success=False)
+    assert breaker.allow() is True
+    breaker.record(success=False)
+    assert breaker.is_open
+    assert breaker.allow() is False
+    time.sleep(0.05)
+    # Only one request is let through to check the source
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record(success=False)
+    assert breaker.allow() is False
+    time.sleep(0.05)
+    assert breaker.allow() is True
+    breaker.record(success=True)
+    assert not breaker.is_open
+    assert breaker.allow() is True
+
+
+@pytest.mark.parametrize(("threshold", "reset"), [(0, 1), (1, -1)])
+def test_circuit_breaker_bad_values(threshold: int, reset: float) -> None:
+    """Test invalid breaker settings."""
+    with pytest.raises(ValueError, match="Threshold"):
+        CircuitBreaker(threshold, reset)
+
+
+def test_circuit_breaker_shared() -> None:
+    """Test breakers are shared per host and settings."""
+    breaker = circuit_breaker("https://example.com/a", 5, 30)
+    assert circuit_breaker("https://example.com/b?c=1", 5, 30) is breaker
+    assert circuit_breaker("https://example.com:8080/a", 5, 30) is not breaker
+    assert circuit_breaker("https://example.com/a", 3, 30) is not breaker
+
+
+class _Retried(CallsHTTP):
+    retry_policy = RetryPolicy(attempts=3, backoff=0.05, jitter=0)
+    circuit_threshold = 2
+    circuit_reset = 0.2
+
+
+@pytest.mark.asyncio
+async def test_call_backoff() -> None:
+    """Test error responses are retried after a delay."""
+    with LocalServer({"/": (200, {}, b"ok")}) as server:
+        server.routes["/"] = lambda _: (429, {}, b"") if len(server.requests) < 3 else (200, {}, b"ok")
+        start = time.monotonic()
+        assert await _Retried()._call(server.url + "/") == "ok"
+        elapsed = time.monotonic() - start
+    assert len(server.requests) == 3
+    assert elapsed >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_call_circuit_breaker() -> None:
+    """Test server errors open the circuit and fail fast until it resets."""
+    with LocalServer({"/": (503, {}, b"")}) as server:
+        url = server.url + "/"
+        serv = _Retried()
+        for _ in range(2):
+            with pytest.raises(SourceError, match="returned 503"):
+                await serv._call(url)
+        # Server errors aren't retried
+        assert len(server.requests) == 2
+        with pytest.raises(SourceError, match="unavailable"):
+            await serv._call(url)
+        assert len(server.requests) == 2
+        await aio.sleep(0.2)
+        server.routes["/"] = (200, {}, b"ok")
+        assert await serv._call(url) == "ok"
+        assert not circuit_breaker(url, 2, 0.2).is_open
+
+
+@pytest.mark.asyncio
+async def test_call_client_errors() -> None:
+    """Test client error responses don't open the circuit."""
+    with LocalServer({}) as server:
+        url = server.url + "/"
+        serv = _Retried()
+        for _ in range(3):
+            with pytest.raises(SourceError, match="returned 404"):
+                await serv._call(url, retries=1)
+        assert len(server.requests) == 3
+        assert not circuit_breaker(url, 2, 0.2).is_open
+
+
+@pytest.mark.asyncio
+async def test_call_connection_errors() -> None:
+    """Test connection failures open the circuit."""
+    with LocalServer({}) as server:
+        url = server.url + "/"
+    serv = _Retried()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await serv._call(url)
+    with pytest.raises(SourceError, match="unavailable"):
+        await serv._call(url)
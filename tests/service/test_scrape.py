@@ -12,6 +12,8 @@ import pytest
 from avwx import exceptions, service
 
 # tests
+from tests.util import LocalServer, Response
+
 from .test_base import ServiceClassTest, ServiceFetchTest
 
 
@@ -194,3 +196,62 @@ def test_get_service(stations: tuple[str], country: str, serv: service.Service)
     for station in stations:
         fetched = service.get_service(station, country)("metar")  # type: ignore
         assert isinstance(fetched, serv)  # type: ignore
+
+
+NOAA_BATCH = b"""KJFK 281651Z 33021G25KT 10SM FEW060 M08/M23 A3054
+KJFK 281551Z 33019G26KT 10SM FEW060 M08/M23 A3052
+TAF AMD EGLL 281700Z 2818/2924 24010KT 9999 SCT030
+      BECMG 2820/2822 27015KT
+"""
+
+
+def _local_noaa(url: str, **attrs: Any) -> type[service.scrape.NoaaScrape]:
+    return type("LocalNoaa", (service.scrape.NoaaScrape,), {"_url": f"{url}/{{}}.php", **attrs})
+
+
+def test_noaa_fetch_many() -> None:
+    """Test batched NOAA requests split reports back to each station."""
+    with LocalServer({"/metar.php": (200, {}, NOAA_BATCH)}) as server:
+        serv = _local_noaa(server.url, batch_size=2)("metar")
+        reports = serv.fetch_many(["KJFK", "EGLL", "KJFK", "PHNL"])
+    assert reports == {
+        "KJFK": "KJFK 281651Z 33021G25KT 10SM FEW060 M08/M23 A3054",
+        "EGLL": "TAF AMD EGLL 281700Z 2818/2924 24010KT 9999 SCT030 BECMG 2820/2822 27015KT",
+        "PHNL": "",
+    }
+    ids = sorted(path.split("ids=")[1].split("&")[0] for _, path, _ in server.requests)
+    assert ids == ["KJFK%2CEGLL", "PHNL"]
+
+
+@pytest.mark.asyncio
+async def test_noaa_fetch_many_matches_fetch() -> None:
+    """Test batched reports match single station extraction."""
+    with LocalServer({"/metar.php": (200, {}, NOAA_BATCH)}) as server:
+        serv = _local_noaa(server.url)("metar")
+        reports = await serv.async_fetch_many(["KJFK"])
+        assert reports["KJFK"] == await serv.async_fetch("KJFK")
+    assert len(server.requests) == 2
+
+
+def test_station_fetch_many() -> None:
+    """Test the generic concurrent fallback for station scrape services."""
+
+    class LocalScrape(service.scrape.StationScrape):
+        _url = ""
+        max_concurrency = 2
+
+        def _make_url(self, station: str) -> tuple[str, dict]:
+            return f"{server.url}/{station}", {}
+
+        def _extract(self, raw: str, station: str) -> str:
+            return self._simple_extract(raw, station, "=")
+
+    routes: dict[str, Response] = {
+        f"/{stn}": (200, {}, f"<p>{stn} 281651Z 33021KT=</p>".encode()) for stn in ("KJFK", "EGLL")
+    }
+    routes["/PHNL"] = (200, {}, b"<p>No report</p>")
+    with LocalServer(routes) as server:
+        reports = LocalScrape("metar").fetch_many(["KJFK", "EGLL", "PHNL"])
+    assert reports == {"KJFK": "KJFK 281651Z 33021KT", "EGLL": "EGLL 281651Z 33021KT", "PHNL": ""}
+    with pytest.raises(exceptions.BadStation):
+        LocalScrape("metar").fetch_many(["KJFK", "12K"])
@@ -0,0 +1,92 @@
+"""Data load utility tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+# library
+import pytest
+
+# module
+from avwx.load_utils import CachedCalc, DiskCache, cache_dir
+
+
+@pytest.fixture
+def temp_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("AVWX_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_cache_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cache directory env overrides."""
+    monkeypatch.setenv("AVWX_CACHE_DIR", "/tmp/avwx-test")
+    assert cache_dir() == Path("/tmp/avwx-test")
+    monkeypatch.setenv("AVWX_CACHE_DIR", "")
+    assert cache_dir() is None
+    monkeypatch.delenv("AVWX_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg")
+    assert cache_dir() == Path("/tmp/xdg/avwx")
+
+
+def test_disk_cache_round_trip(temp_cache: Path) -> None:
+    """Test cached values are read by a new cache instance."""
+    cache = DiskCache("test", lambda: "v1")
+    assert cache.get("value") is None
+    cache.set("value", {"a": [1, 2]})
+    assert (temp_cache / "test" / "value.pickle").exists()
+    assert DiskCache("test", lambda: "v1").get("value") == {"a": [1, 2]}
+
+
+def test_disk_cache_separate_entries(temp_cache: Path) -> None:  # noqa: ARG001
+    """Test caches sharing a directory don't overwrite each other's entries."""
+    first, second = DiskCache("test", lambda: "v1"), DiskCache("test", lambda: "v1")
+    first.set("a", 1)
+    second.set("b", 2)
+    first.set("c", 3)
+    cache = DiskCache("test", lambda: "v1")
+    assert [cache.get(name) for name in "abc"] == [1, 2, 3]
+
+
+def test_disk_cache_stale(temp_cache: Path) -> None:
+    """Test a changed data key ignores old values."""
+    DiskCache("test", lambda: "v1").set("value", 1)
+    cache = DiskCache("test", lambda: "v2")
+    assert cache.get("value") is None
+    cache.set("other", 2)
+    assert DiskCache("test", lambda: "v1").get("other") is None
+    cache.clear()
+    assert not list((temp_cache / "test").iterdir())
+
+
+def test_disk_cache_corrupt(temp_cache: Path) -> None:
+    """Test an unreadable cache entry is ignored."""
+    (temp_cache / "test").mkdir()
+    (temp_cache / "test" / "value.pickle").write_bytes(b"not a pickle")
+    cache = DiskCache("test", lambda: "v1")
+    assert cache.get("value") is None
+    cache.set("value", 1)
+    assert DiskCache("test", lambda: "v1").get("value") == 1
+
+
+def test_disk_cache_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test values are kept in memory when the cache is disabled."""
+    monkeypatch.setenv("AVWX_CACHE_DIR", "")
+    cache = DiskCache("test", lambda: "v1")
+    assert cache.path is None
+    cache.set("value", 1)
+    assert cache.get("value") == 1
+
+
+def test_cached_calc(temp_cache: Path) -> None:  # noqa: ARG001
+    """Test CachedCalc only runs its function on a cache miss."""
+    calls = []
+
+    def func() -> list[int]:
+        calls.append(1)
+        return [1, 2, 3]
+
+    assert CachedCalc(func, DiskCache("test", lambda: "v1"), "calc").value == [1, 2, 3]
+    assert CachedCalc(func, DiskCache("test", lambda: "v1"), "calc").value == [1, 2, 3]
+    assert len(calls) == 1
+    assert CachedCalc(func, DiskCache("test", lambda: "v2"), "calc").value == [1, 2, 3]
+    assert len(calls) == 2
@@ -1,17 +1,26 @@
 """Station Data Tests."""
 
-# ruff: noqa: FBT001
+# ruff: noqa: FBT001,SLF001
 
 # stdlib
 from __future__ import annotations
 
+import sys
+from dataclasses import FrozenInstanceError, replace
+from pathlib import Path
 from typing import Any
 
 # library
 import pytest
+from geopy.distance import great_circle  # type: ignore
 
 # module
 from avwx import exceptions, station
+from avwx.load_utils import CachedCalc
+from avwx.station import table as table_module
+from avwx.station.grid import GridIndex
+from avwx.station.meta import DERIVED_CACHE
+from avwx.structs import Coord
 
 NA_CODES = {"KJFK", "PHNL", "TNCM", "MYNN"}
 IN_CODES = {"EGLL", "MNAH", "MUHA"}
@@ -109,6 +118,146 @@ def test_nearest_filter(airport: bool, reports: bool, count: int) -> None:
     assert len(stations) == count
 
 
+@pytest.mark.parametrize(("lat", "lon"), [(89.9, 10), (-89.9, -170), (-16.5, 179.99), (-16.5, -179.99), (64, -170)])
+def test_nearest_sphere(lat: float, lon: float) -> None:
+    """Test nearest matches great circle distance at the poles and across +/-180."""
+    stations = station.nearest(lat, lon, 3, sends_reports=False, max_coord_distance=180)
+    assert isinstance(stations, list)
+    coords = station.station._COORDS.value
+    expected = sorted(great_circle((lat, lon), c[1:]).nm for c in coords)[:3]
+    for found, distance in zip(stations, expected, strict=True):
+        assert found["nautical_miles"] == pytest.approx(distance)
+        assert found["nautical_miles"] == pytest.approx(found["station"].distance(lat, lon).nm)
+
+
+@pytest.mark.parametrize(("airport", "reports"), [(True, True), (True, False), (False, True), (False, False)])
+def test_nearest_many(airport: bool, reports: bool) -> None:
+    """Test batch nearest query matches individual queries."""
+    lats, lons = [28.43, 51.47, -16.5, 0], [-81.31, -0.46, 179.99, 0]
+    results = station.nearest_many(lats, lons, 3, is_airport=airport, sends_reports=reports, max_coord_distance=5)
+    assert len(results) == 4
+    assert results.index.shape == results.nautical_miles.shape == (4, 3)
+    for i, (lat, lon) in enumerate(zip(lats, lons, strict=True)):
+        expected = station.nearest(lat, lon, 3, is_airport=airport, sends_reports=reports, max_coord_distance=5)
+        assert isinstance(expected, list)
+        assert results.idents(i) == [s["station"].lookup_code for s in expected]
+        assert [s.lookup_code for s in results.stations(i)] == results.idents(i)
+        for dist, value in zip(results.nautical_miles[i], expected, strict=False):
+            assert dist == pytest.approx(value["nautical_miles"])
+
+
+def test_nearest_many_out_of_range() -> None:
+    """Test batch nearest padding when no stations are in range."""
+    results = station.nearest_many([0.123], [-140.456], 2, max_coord_distance=0)
+    assert results.idents(0) == []
+    assert list(results.index[0]) == [-1, -1]
+    assert all(dist == float("inf") for dist in results.nautical_miles[0])
+
+
+@pytest.mark.parametrize(("lat", "lon", "n", "dist"), [(28.43, -81.31, 1, 10), (89.9, 10, 5, 180), (-16.5, 179.99, 11, 5)])
+def test_grid_index(lat: float, lon: float, n: int, dist: float) -> None:
+    """Test the built-in grid index matches the scipy KDTree."""
+    coords = station.station._COORDS.value
+    grid = GridIndex([station.station._to_xyz(*c[1:]) for c in coords])
+    point = station.station._to_xyz(lat, lon)
+    bound = station.station._arc_to_chord(dist)
+    grid_dist, _ = grid.query(point, n, distance_upper_bound=bound)
+    tree_dist, _ = station.station._COORD_TREE.value.query(point, n, distance_upper_bound=bound)
+    assert grid_dist == pytest.approx(list(tree_dist) if n > 1 else tree_dist)
+
+
+def test_nearest_without_scipy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test nearest falls back to the grid index without scipy installed."""
+    monkeypatch.setitem(sys.modules, "scipy.spatial", None)
+    tree = station.station._build_tree(station.station._COORDS.value)
+    assert isinstance(tree, GridIndex)
+    monkeypatch.setattr(station.station._FILTERED_TREES[False, False], "_value", (tree, None))
+    station.station._query_filter.cache_clear()
+    stations = station.nearest(28.43, -81.31, 5, sends_reports=False)
+    station.station._query_filter.cache_clear()
+    assert isinstance(stations, list)
+    assert stations[0]["station"].lookup_code == "KMCO"
+
+
+def test_tree_cache_backend() -> None:
+    """Test a tree cached without scipy isn't reused once scipy is installed."""
+    pytest.importorskip("scipy")
+    coords = station.station._COORDS.value
+    DERIVED_CACHE.set("coord_tree_grid", GridIndex([station.station._to_xyz(*c[1:]) for c in coords]))
+    name = f"coord_tree_{station.station._TREE_BACKEND}"
+    assert name == "coord_tree_kdtree"
+    assert not isinstance(CachedCalc(station.station._make_coord_tree, DERIVED_CACHE, name).value, GridIndex)
+
+
+@pytest.mark.parametrize("dist", [0.5, 10, 180])
+def test_grid_index_ball_point(dist: float) -> None:
+    """Test the built-in grid index radius query matches the scipy KDTree."""
+    coords = station.station._COORDS.value
+    grid = GridIndex([station.station._to_xyz(*c[1:]) for c in coords])
+    point = station.station._to_xyz(40.64, -73.78)
+    bound = station.station._arc_to_chord(dist)
+    tree = station.station._COORD_TREE.value
+    assert sorted(grid.query_ball_point(point, bound)) == sorted(tree.query_ball_point(point, bound))
+
+
+def _within_brute(check: Any, *, is_airport: bool = False, sends_reports: bool = True) -> list[str]:
+    coords = station.station._COORDS.value
+    filters = station.station._COORD_FILTERS.value
+    return [
+        code
+        for (code, lat, lon), (airport, reports) in zip(coords, filters, strict=True)
+        if check(lat, lon) and (airport or not is_airport) and (reports or not sends_reports)
+    ]
+
+
+@pytest.mark.parametrize("is_airport", [True, False])
+@pytest.mark.parametrize("sends_reports", [True, False])
+@pytest.mark.parametrize("bbox", [(40, -75, 41.5, -72.5), (-20, 170, -10, -170), (80, -180, 90, 180)])
+def test_stations_within_bbox(
+    bbox: tuple[float, float, float, float], is_airport: bool, sends_reports: bool
+) -> None:
+    """Test finding stations inside a bounding box."""
+    idents = station.stations_within(bbox, is_airport=is_airport, sends_reports=sends_reports)
+    expected = _within_brute(
+        lambda lat, lon: station.station._in_bbox(lat, lon, bbox),
+        is_airport=is_airport,
+        sends_reports=sends_reports,
+    )
+    assert set(idents) == set(expected)
+    if bbox[0] == 40 and sends_reports:
+        assert "KJFK" in idents
+
+
+def test_stations_within_polygon() -> None:
+    """Test finding stations inside a polygon."""
+    points = [(27, -83), (31, -82), (29, -79), (26, -80.5)]
+    coords = [Coord(lat, lon) for lat, lon in points]
+    idents = station.stations_within(coords, sends_reports=False)
+    assert idents
+    assert "KMCO" in idents
+    assert idents == station.stations_within(points, sends_reports=False)
+    expected = _within_brute(lambda lat, lon: station.station._in_polygon(lat, lon, points), sends_reports=False)
+    assert set(idents) == set(expected)
+    stations = station.stations_within(coords, sends_reports=False, as_stations=True)
+    assert [stn.lookup_code for stn in stations] == idents  # type: ignore
+    box = station.stations_within((26, -83, 31, -79), sends_reports=False)
+    assert set(idents) < set(box)
+
+
+def test_stations_within_shapely() -> None:
+    """Test finding stations inside a shapely polygon."""
+    shapely = pytest.importorskip("shapely.geometry")
+    points = [(27, -83), (31, -82), (29, -79), (26, -80.5)]
+    idents = station.stations_within(shapely.Polygon(points), sends_reports=False)
+    assert idents == station.stations_within(points, sends_reports=False)
+
+
+def test_stations_within_bad_polygon() -> None:
+    """Test polygon areas need at least three points."""
+    with pytest.raises(ValueError, match="three"):
+        station.stations_within([(27, -83), (31, -82)])
+
+
 # Test Station class
 
 BAD_STATION_CODES = {"1234", 1234, None, True, ""}
@@ -117,22 +266,38 @@ BAD_STATION_CODES = {"1234", 1234, None, True, ""}
 def test_storage_code() -> None:
     """Test ID code selection."""
     stn = station.Station.from_icao("KJFK")
-    stn.icao = "ICAO"
-    stn.iata = "IATA"
-    stn.gps = "GPS"
-    stn.local = "LOCAL"
+    stn = replace(stn, icao="ICAO", iata="IATA", gps="GPS", local="LOCAL")
     assert stn.storage_code == "ICAO"
-    stn.icao = None
+    stn = replace(stn, icao=None)
     assert stn.storage_code == "IATA"
-    stn.iata = None
+    stn = replace(stn, iata=None)
     assert stn.storage_code == "GPS"
-    stn.gps = None
+    stn = replace(stn, gps=None)
     assert stn.storage_code == "LOCAL"
-    stn.local = None
+    stn = replace(stn, local=None)
     with pytest.raises(exceptions.BadStation):
         assert stn.storage_code
 
 
+def test_station_immutable() -> None:
+    """Test that Stations can't be modified."""
+    stn = station.Station.from_icao("KJFK")
+    with pytest.raises(FrozenInstanceError):
+        stn.icao = "ICAO"  # type: ignore
+
+
+def test_station_cache() -> None:
+    """Test that repeat lookups return the same cached Station."""
+    station.Station.cache_clear()
+    first = station.Station.from_code("KJFK")
+    assert station.Station.cache_info().misses == 1
+    assert station.Station.from_icao("kjfk") is first
+    assert station.Station.from_iata("JFK") is first
+    info = station.Station.cache_info()
+    assert info.hits == 2
+    assert info.currsize == 1
+
+
 @pytest.mark.parametrize(
     ("icao", "name", "city"),
     [
@@ -232,6 +397,15 @@ def test_from_bad_code(code: Any) -> None:
         station.Station.from_code(code)
 
 
+def test_from_codes() -> None:
+    """Test loading many Stations at once with misses returned as None."""
+    codes = ["KJFK", "lhr", "KX07", "1234", None, "", "KJFK"]
+    stations = station.Station.from_codes(codes)  # type: ignore
+    assert len(stations) == len(codes)
+    assert [s.lookup_code if s else None for s in stations] == ["KJFK", "EGLL", "KX07", None, None, None, "KJFK"]
+    assert stations[0] is stations[-1]
+
+
 @pytest.mark.parametrize(("lat", "lon", "icao"), [(28.43, -81.31, "KMCO"), (28.43, -81, "KTIX")])
 def test_station_nearest(lat: float, lon: float, icao: str) -> None:
     """Test loading a Station nearest to a lat,lon coordinate pair."""
@@ -339,9 +513,155 @@ def test_combined_terms(text: str, icao: str) -> None:
     assert results[0].lookup_code == icao
 
 
+def test_misspelled_search() -> None:
+    """Test misspelled words still match when other words share a common prefix."""
+    # "x" begins thousands of idents but not the private field's
+    results = station.search("pirvate feild x", sends_reports=False)
+    assert results[0].lookup_code == "FA18"
+
+
+def test_search_narrowing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only stations sharing a prefix with every word are scored if there are enough."""
+    search_module = sys.modules["avwx.station.search"]
+    extract = search_module._extract
+    sizes: list[int] = []
+
+    def spy(text: str, corpus: dict[str, str], limit: int) -> Any:
+        sizes.append(len(corpus))
+        return extract(text, corpus, limit)
+
+    monkeypatch.setattr(search_module, "_extract", spy)
+    full = len(search_module._CORPUS.value)
+    assert station.search.__wrapped__("john f kennedy")[0].lookup_code == "KJFK"
+    assert len(sizes) == 1
+    assert 10 <= sizes[0] < full
+    # Fewer narrowed matches than the limit also checks every station
+    sizes.clear()
+    assert station.search.__wrapped__("kennedy")[0].lookup_code == "KJFK"
+    assert sizes[-1] == full
+
+
 def test_search_filter() -> None:
     """Test search result filtering."""
     for airport in station.search("orlando", is_airport=True):
         assert "airport" in airport.type
     for airport in station.search("orlando", sends_reports=True):
         assert airport.reporting is True
+
+
+@pytest.mark.parametrize(
+    ("text", "icao"),
+    [
+        ("KJF", "KJFK"),
+        ("kjfk", "KJFK"),
+        ("LHR", "EGLL"),
+        ("london heath", "EGLL"),
+        ("lexington blue", "KLEX"),
+    ],
+)
+def test_prefix_search(text: str, icao: str) -> None:
+    """Test autocomplete search by ident, name, and city prefixes."""
+    results = station.prefix_search(text)
+    assert 0 < len(results) <= 10
+    assert results[0].icao == icao
+
+
+def test_prefix_search_filter() -> None:
+    """Test autocomplete search result filtering."""
+    assert station.prefix_search("") == []
+    assert 0 < len(station.prefix_search("new", 3)) <= 3
+    for airport in station.prefix_search("orl", 20, is_airport=True, sends_reports=False):
+        assert "airport" in airport.type
+    for airport in station.prefix_search("orl", 20):
+        assert airport.reporting is True
+
+
+# Test station table
+
+TABLE_DATA: dict[str, dict] = {
+    "KTST": {
+        "city": "Testville",
+        "country": "US",
+        "elevation_ft": 100,
+        "elevation_m": 30,
+        "gps": "KTST",
+        "iata": "TST",
+        "icao": "KTST",
+        "latitude": 12.5,
+        "local": None,
+        "longitude": -45.25,
+        "name": "Test Airport – Ünicode",
+        "note": None,
+        "reporting": True,
+        "runways": [
+            {
+                "length_ft": 5000,
+                "width_ft": 100,
+                "surface": "asphalt",
+                "lights": True,
+                "ident1": "09",
+                "ident2": "27",
+                "bearing1": 90.0,
+                "bearing2": None,
+            }
+        ],
+        "state": None,
+        "type": "small_airport",
+        "website": None,
+        "wiki": None,
+    },
+    "AAAA": {
+        "city": None,
+        "country": "PG",
+        "elevation_ft": None,
+        "elevation_m": None,
+        "gps": None,
+        "iata": None,
+        "icao": "AAAA",
+        "latitude": -4.13,
+        "local": None,
+        "longitude": 152.1,
+        "name": "WEATHER STATION",
+        "note": None,
+        "reporting": False,
+        "runways": None,
+        "state": None,
+        "type": "weather_station",
+        "website": None,
+        "wiki": None,
+    },
+}
+
+
+@pytest.fixture
+def table(tmp_path: Path) -> table_module.StationTable:
+    path = tmp_path / "stations.bin"
+    table_module.write_table(TABLE_DATA, path)
+    stations = table_module.StationTable("stations")
+    stations.source = path
+    return stations
+
+
+def test_table_round_trip(table: table_module.StationTable) -> None:
+    """Test that station info is unchanged after writing and reading the table."""
+    assert table.is_mapped is True
+    assert len(table) == len(TABLE_DATA)
+    assert list(table) == sorted(TABLE_DATA)
+    for key, info in TABLE_DATA.items():
+        assert key in table
+        assert table[key] == info
+    assert dict(table.items()) == TABLE_DATA
+
+
+@pytest.mark.parametrize("code", ["KTS", "ZZZZ", "", 1234])
+def test_table_missing(table: table_module.StationTable, code: Any) -> None:
+    assert code not in table
+    with pytest.raises(KeyError):
+        table[code]
+
+
+def test_table_fallback(tmp_path: Path) -> None:
+    """Test that the table defers to the JSON file when the table doesn't exist."""
+    stations = table_module.StationTable("stations")
+    stations.source = tmp_path / "missing.bin"
+    assert stations.is_mapped is False
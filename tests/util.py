@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import json
+import threading
+from collections.abc import Callable
 from contextlib import suppress
 from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -13,7 +16,12 @@ from typing import TYPE_CHECKING, Any
 from avwx import structs
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterator, Mapping
+
+# (status, headers, body) returned by a LocalServer route
+Response = tuple[int, dict[str, str], bytes]
+# A fixed response or a function taking the request headers and returning one
+Route = Response | Callable[..., Response]
 
 
 def assert_number(
@@ -94,3 +102,72 @@ def round_coordinates(data: Any) -> Any:
     elif isinstance(data, list):
         data = [round_coordinates(i) for i in data]
     return data
+
+
+class LocalServer:
+    """Local keep-alive HTTP server standing in for report sources.
+
+    Routes map a path to a (status, headers, body) tuple or a function taking
+    the request headers and returning one. Requests and opened connections
+    are recorded so tests can check what was sent.
+    """
+
+    def __init__(self, routes: Mapping[str, Route]):
+        self.routes: dict[str, Route] = dict(routes)
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                server.connections += 1
+                super().setup()
+
+            def log_message(self, *_: Any) -> None:
+                pass
+
+            def _respond(self, *, body: bool = True) -> None:
+                headers = dict(self.headers.items())
+                path = self.path.split("?")[0]
+                server.requests.append((self.command, self.path, headers))
+                route = server.routes.get(path, (404, {}, b""))
+                status, resp_headers, content = route(headers) if callable(route) else route
+                self.send_response(status)
+                for key, value in resp_headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(content)
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._respond()
+
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._respond()
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                self._respond(body=False)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        # Short poll so shutdown doesn't wait out the default half second
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> LocalServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()